@@ -1,11 +1,24 @@
+import cProfile
+from collections import deque
+from contextlib import contextmanager
+
 import streamlit as st
 import numpy as np
-import pandas as pd
+import plotly.colors
 import plotly.graph_objects as go
 from datetime import datetime
 
-from model import BlackScholes
+from archive import Archive
+from attribution import TERMS, AttributionSummary, attribute_history
+from charts import HEATMAP_METRICS, chart_axes, generate_heatmap, payload_bytes
+from model import AmericanLattice, BlackScholes
+from grid import GridSpec, PriceGrid, price_grid
+from cache import LRUCache
+from implied_vol import implied_volatility
+from vol_surface import VolSurface, demo_chain
 import database as db
+import perf
+from styles import inject_custom_css
 
 st.set_page_config(
     page_title="Black-Scholes Dashboard",
@@ -13,248 +26,25 @@ st.set_page_config(
     layout="wide",
 )
 
+# Timings and profiles are opt-in from the Performance panel at the bottom
+perf.start_run("app", enabled=st.session_state.get("perf_enabled", False))
+profiler = None
+if st.session_state.get("perf_profile", False):
+    profiler = cProfile.Profile()
+    profiler.enable()
 
-def inject_custom_css() -> None:
-    """
-    Inject comprehensive iOS/Apple-style CSS for system fonts and refined UI.
-    
-    This function enforces:
-    - System font stack (San Francisco on Mac, Segoe UI on Windows)
-    - Apple-style header typography with tight letter-spacing
-    - Metric cards with rounded corners and subtle shadows
-    - Consistent design across all components
-    """
-    css = """
-    <style>
-        /* Global Font Stack - System fonts for platform-native feel */
-        html, body, [class*="css"] {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-        }
-        
-        * {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-        }
-        
-        /* Header Styling - Classic Apple weight and letter-spacing */
-        h1, h2, h3, h4, h5, h6 {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-            font-weight: 700 !important;
-            letter-spacing: -0.5px !important;
-        }
-        
-        h1 {
-            font-size: 2.4rem !important;
-            margin-bottom: 0.5rem !important;
-            color: #1D1D1F !important;
-        }
-        
-        h2 {
-            font-size: 1.8rem !important;
-            margin-top: 2rem !important;
-            margin-bottom: 1rem !important;
-            color: #1D1D1F !important;
-        }
-        
-        h3 {
-            font-size: 1.3rem !important;
-            margin-top: 1.5rem !important;
-            margin-bottom: 0.8rem !important;
-            color: #1D1D1F !important;
-        }
-        
-        /* Body text */
-        p, label, div, span {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
-            font-weight: 400 !important;
-            font-size: 1rem !important;
-            line-height: 1.6 !important;
-            color: #1D1D1F !important;
-        }
-        
-        /* Metric Cards - White boxes with rounded corners and subtle shadow */
-        [data-testid="stMetric"] {
-            background-color: #FFFFFF !important;
-            border: 1px solid rgba(0, 0, 0, 0.05) !important;
-            border-radius: 18px !important;
-            padding: 20px !important;
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.08) !important;
-            transition: all 0.3s cubic-bezier(0.34, 1.56, 0.64, 1) !important;
-        }
-        
-        [data-testid="stMetric"]:hover {
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.12) !important;
-            transform: translateY(-4px) !important;
-        }
-        
-        [data-testid="stMetricLabel"] {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif !important;
-            font-size: 0.9rem !important;
-            font-weight: 500 !important;
-            color: #86868B !important;
-            text-transform: none !important;
-            margin-bottom: 8px !important;
-            letter-spacing: 0px !important;
-        }
-        
-        [data-testid="stMetricValue"] {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif !important;
-            font-size: 1.9rem !important;
-            font-weight: 700 !important;
-            color: #1D1D1F !important;
-            letter-spacing: -0.5px !important;
-        }
-        
-        /* Sidebar Styling */
-        [data-testid="stSidebar"] {
-            background-color: #F5F5F7 !important;
-        }
-        
-        [data-testid="stSidebar"] > div:first-child {
-            padding-top: 1.5rem !important;
-        }
-        
-        /* Number Input Fields */
-        [data-testid="stNumberInput"] input {
-            border-radius: 12px !important;
-            border: 1px solid #E5E5EA !important;
-            padding: 12px 14px !important;
-            font-size: 1rem !important;
-            background-color: #FFFFFF !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-        }
-        
-        [data-testid="stNumberInput"] input:focus {
-            border-color: #007AFF !important;
-            box-shadow: 0 0 0 3px rgba(0, 122, 255, 0.1) !important;
-            outline: none !important;
-        }
-        
-        /* Text Input Fields */
-        input[type="text"], input[type="password"] {
-            border-radius: 12px !important;
-            border: 1px solid #E5E5EA !important;
-            padding: 12px 14px !important;
-            font-size: 1rem !important;
-            background-color: #FFFFFF !important;
-        }
-        
-        input[type="text"]:focus, input[type="password"]:focus {
-            border-color: #007AFF !important;
-            box-shadow: 0 0 0 3px rgba(0, 122, 255, 0.1) !important;
-        }
-        
-        /* Primary Button */
-        button[kind="primary"] {
-            background-color: #007AFF !important;
-            color: #FFFFFF !important;
-            border: none !important;
-            border-radius: 12px !important;
-            font-weight: 600 !important;
-            font-size: 1rem !important;
-            padding: 12px 20px !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-            transition: all 0.2s ease !important;
-        }
-        
-        button[kind="primary"]:hover {
-            background-color: #0051D5 !important;
-            box-shadow: 0 6px 12px rgba(0, 122, 255, 0.3) !important;
-        }
-        
-        button[kind="primary"]:active {
-            background-color: #0041B8 !important;
-            transform: scale(0.98) !important;
-        }
-        
-        /* Secondary Button */
-        button[kind="secondary"] {
-            background-color: #F5F5F7 !important;
-            color: #007AFF !important;
-            border: 1px solid #E5E5EA !important;
-            border-radius: 12px !important;
-            font-weight: 600 !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-        }
-        
-        button[kind="secondary"]:hover {
-            background-color: #EBEBF0 !important;
-        }
-        
-        /* Radio Buttons */
-        [data-testid="stRadio"] {
-            margin-top: 0.5rem !important;
-        }
-        
-        [data-testid="stRadio"] label {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-            font-weight: 500 !important;
-            color: #1D1D1F !important;
-            margin-left: 8px !important;
-        }
-        
-        /* Checkbox */
-        [data-testid="stCheckbox"] label {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-            font-weight: 500 !important;
-            color: #1D1D1F !important;
-            margin-left: 8px !important;
-        }
-        
-        /* Dividers */
-        hr {
-            border: none !important;
-            height: 1px !important;
-            background: rgba(0, 0, 0, 0.08) !important;
-            margin: 2rem 0 !important;
-        }
-        
-        /* Dataframe Table */
-        [data-testid="stDataframe"] {
-            border: 1px solid #E5E5EA !important;
-            border-radius: 14px !important;
-            overflow: hidden !important;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.06) !important;
-        }
-        
-        /* Info Message */
-        [data-testid="stInfo"] {
-            background-color: #E8F4FF !important;
-            border: 1px solid #B3D9FF !important;
-            border-radius: 14px !important;
-            padding: 15px !important;
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
-        }
-        
-        /* Warning Message */
-        [data-testid="stWarning"] {
-            background-color: #FFF8E1 !important;
-            border: 1px solid #FFD966 !important;
-            border-radius: 14px !important;
-            padding: 15px !important;
-        }
-        
-        /* Error Message */
-        [data-testid="stError"] {
-            background-color: #FFE8E8 !important;
-            border: 1px solid #FF6B6B !important;
-            border-radius: 14px !important;
-            padding: 15px !important;
-        }
-        
-        /* Success Message */
-        [data-testid="stSuccess"] {
-            background-color: #E8F5E9 !important;
-            border: 1px solid #81C784 !important;
-            border-radius: 14px !important;
-            padding: 15px !important;
-        }
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
+
+def stop() -> None:
+    """st.stop(), first closing this rerun's perf run and profiler, which would otherwise stay open."""
+    perf.end_run()
+    if profiler is not None:
+        profiler.disable()
+    st.stop()
 
 
 # Inject iOS/Apple-style CSS at app startup
-inject_custom_css()
+with perf.stage("css"):
+    inject_custom_css()
 
 st.title("Black-Scholes Option Pricing")
 
@@ -281,13 +71,34 @@ with st.sidebar:
         step=0.01,
         help="Enter 0.5 for 6 months, 0.25 for 3 months, etc.",
     )
-    sigma = st.number_input(
-        "Volatility (%)",
-        min_value=0.0,
-        value=20.0,
-        step=0.5,
-        help="Historical or implied volatility; 0 = no uncertainty",
-    ) / 100
+    vol_mode = st.radio(
+        "Volatility Input",
+        options=["Direct", "Implied from Market Price", "Surface (SVI)"],
+        help="Enter volatility directly, back it out from a quoted option price, or read it off an SVI surface fitted to a chain",
+    )
+    if vol_mode == "Direct":
+        sigma = st.number_input(
+            "Volatility (%)",
+            min_value=0.0,
+            value=20.0,
+            step=0.5,
+            help="Historical or implied volatility; 0 = no uncertainty",
+        ) / 100
+    elif vol_mode == "Implied from Market Price":
+        quoted_type = st.radio("Quoted Option", options=["Call", "Put"], horizontal=True)
+        market_price = st.number_input(
+            "Market Price ($)",
+            min_value=0.0,
+            value=10.45,
+            step=0.1,
+            help="Observed option premium to solve for implied volatility",
+        )
+    else:
+        chain_file = st.file_uploader(
+            "Vol Chain (CSV)",
+            type="csv",
+            help="Columns K, T (years) and iv (decimal), at least 5 strikes per expiry. Leave empty for a demo chain.",
+        )
     r = st.number_input(
         "Risk-Free Rate (%)",
         min_value=0.0,
@@ -296,6 +107,46 @@ with st.sidebar:
         help="Annual risk-free interest rate (e.g., Treasury yield)",
     ) / 100
 
+    surface = None
+    if vol_mode == "Surface (SVI)":
+        if chain_file is None:
+            chain_K, chain_T, chain_iv = demo_chain(S, r)
+        else:
+            import pandas as pd
+
+            chain = pd.read_csv(chain_file)
+            missing = {"K", "T", "iv"} - set(chain.columns)
+            if missing:
+                st.error(f"Vol chain is missing column(s): {', '.join(sorted(missing))}")
+                stop()
+            chain_K, chain_T, chain_iv = (chain[c].to_numpy(dtype=float) for c in ("K", "T", "iv"))
+        try:
+            # Slices whose quotes are unchanged come from the fit cache
+            with perf.stage("vol_surface"):
+                surface = VolSurface(S, r).calibrate(chain_K, chain_T, chain_iv)
+        except ValueError as exc:
+            st.error(f"Could not fit the vol surface: {exc}")
+            stop()
+        sigma = float(surface.sigma(K, T))
+        st.caption(
+            f"Surface volatility: {sigma * 100:.2f}% · {len(surface.slices)} expiries, "
+            f"{surface.last_refit} refitted"
+        )
+    elif vol_mode != "Direct":
+        with perf.stage("implied_vol"):
+            iv = implied_volatility(market_price, S, K, T, r, quoted_type)
+        if iv.failed:
+            st.error("No implied volatility: the price is at or outside the no-arbitrage bounds, or too insensitive to volatility to pin it down.")
+            stop()
+        sigma = float(iv.sigma)
+        st.caption(f"Implied volatility: {sigma * 100:.2f}% ({int(iv.iterations)} iterations)")
+
+    american = st.checkbox(
+        "American Exercise",
+        value=False,
+        help="Price with early exercise on a binomial lattice instead of Black-Scholes",
+    )
+
     st.markdown("---")
     
     # P&L Simulator
@@ -310,23 +161,27 @@ with st.sidebar:
             help="Your original option purchase price",
         )
 
-    st.markdown("---")
-    calculate = st.button("Calculate", type="primary", use_container_width=True)
+with perf.stage("price_all"):
+    bs = BlackScholes(S, K, T, r, sigma)
+    values = bs.price_all()
+call_price = values.call_price
+put_price = values.put_price
+call_greeks = values.call_greeks
+put_greeks = values.put_greeks
 
-bs = BlackScholes(S, K, T, r, sigma)
-call_price = bs.call_price()
-put_price = bs.put_price()
-call_greeks = bs.call_greeks()
-put_greeks = bs.put_greeks()
-
-if calculate:
-    db.save_calculation(S, K, T, r, sigma, call_price, put_price)
+price_label = "Price"
+call_display, put_display = call_price, put_price
+if american:
+    with perf.stage("american_lattice"):
+        lattice = AmericanLattice(S, K, T, r, sigma)
+        call_display, put_display = float(lattice.call_price()), float(lattice.put_price())
+    price_label = "Price (American)"
 
 col_call, col_put = st.columns(2, gap="large")
 
 with col_call:
     st.markdown("### Call Option")
-    st.metric("Price", f"${call_price:,.4f}")
+    st.metric(price_label, f"${call_display:,.4f}")
     g = call_greeks
     c1, c2, c3 = st.columns(3)
     c1.metric("Delta", f"{g.delta:.4f}")
@@ -338,7 +193,7 @@ with col_call:
 
 with col_put:
     st.markdown("### Put Option")
-    st.metric("Price", f"${put_price:,.4f}")
+    st.metric(price_label, f"${put_display:,.4f}")
     g = put_greeks
     c1, c2, c3 = st.columns(3)
     c1.metric("Delta", f"{g.delta:.4f}")
@@ -348,124 +203,402 @@ with col_put:
     c4.metric("Vega", f"{g.vega:.4f}")
     c5.metric("Rho", f"{g.rho:.4f}")
 
+if american:
+    st.caption("American prices use a 200-step binomial lattice with Richardson extrapolation; Greeks are Black-Scholes.")
+
+if surface is not None:
+    with st.expander("Volatility Surface"):
+        fig = go.Figure()
+        palette = plotly.colors.qualitative.Plotly
+        for i, fit in enumerate(surface.slices.values()):
+            rows = chain_T == fit.T
+            strikes = np.linspace(chain_K[rows].min(), chain_K[rows].max(), 100)
+            # Plotly resolves default colours in the browser, so pick one to share with the quotes
+            color, group = palette[i % len(palette)], f"T = {fit.T:g}"
+            fig.add_scatter(
+                x=strikes,
+                y=surface.smile(fit.T, strikes) * 100,
+                mode="lines",
+                line=dict(color=color),
+                name=group,
+                legendgroup=group,
+            )
+            fig.add_scatter(
+                x=chain_K[rows],
+                y=chain_iv[rows] * 100,
+                mode="markers",
+                marker=dict(size=6, color=color),
+                legendgroup=group,
+                showlegend=False,
+            )
+        fig.add_scatter(x=[K], y=[sigma * 100], mode="markers", marker=dict(symbol="star", size=14, color="#1d1d1f"), name="This option")
+        fig.update_layout(
+            xaxis_title="Strike ($)",
+            yaxis_title="Implied Volatility (%)",
+            height=400,
+            font=dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13),
+            margin=dict(l=0, r=0, t=20, b=0),
+            plot_bgcolor="rgba(255, 255, 255, 0.9)",
+            paper_bgcolor="rgba(245, 245, 247, 0)",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            "Fit error (RMSE): "
+            + " · ".join(f"T = {fit.T:g}: {fit.rmse * 1e4:.1f} bp" for fit in surface.slices.values())
+        )
+
 st.markdown("---")
 
 
-def generate_heatmap(option_type: str, chart_style: str, purchase_price: float | None = None, simulate_pnl: bool = False) -> go.Figure:
-    spot_range = np.linspace(S * 0.7, S * 1.3, 25)
-    vol_range = np.linspace(max(0.05, sigma * 0.5), sigma * 1.5, 25)
+RESOLUTIONS = [25, 50, 100, 250, 500, 1000]
+AMERICAN_MAX_RESOLUTION = 50
+# Lattice steps per American grid cell: ~7x faster than the headline's 200, within ~$0.02
+AMERICAN_GRID_STEPS = 50
+# Most cells a chart can usefully show per axis; larger grids are downsampled
+MAX_HEATMAP_POINTS = 200
+MAX_SURFACE_POINTS = 100
+# Process-wide cap on cached grids; a 1000x1000 float32 grid with Greeks is ~38 MB
+GRID_CACHE_BYTES = 256 * 1024**2
+# Recorded reruns kept for the Performance panel
+PERF_HISTORY = 10
+# Latest attributed price changes listed under History
+ATTRIBUTION_ROWS = 50
 
-    prices = np.zeros((len(vol_range), len(spot_range)))
-    for i, vol in enumerate(vol_range):
-        for j, spot in enumerate(spot_range):
-            model = BlackScholes(spot, K, T, r, vol)
-            prices[i, j] = model.call_price() if option_type == "Call" else model.put_price()
 
-    # Calculate Z-values (P&L or Price)
-    z_values = prices
-    if simulate_pnl and purchase_price is not None:
-        z_values = prices - purchase_price
-    
-    # Set title and colorbar based on simulation mode
-    if simulate_pnl and purchase_price is not None:
-        colorbar_title = "P&L ($)"
-        chart_title = f"{option_type} P&L Sensitivity"
-    else:
-        colorbar_title = "Price ($)"
-        chart_title = f"{option_type} Price Sensitivity"
+@st.cache_resource
+def get_grid_cache() -> LRUCache:
+    # Shared across sessions; holds raw price grids so restyling is free
+    return LRUCache(maxsize=32, max_bytes=GRID_CACHE_BYTES, sizeof=lambda grid: grid.nbytes)
 
-    # Determine colorscale based on P&L mode
-    if simulate_pnl and purchase_price is not None:
-        colorscale = "RdYlGn"
-    else:
-        colorscale = "Viridis"
-
-    if chart_style == "3D Surface":
-        # 3D Surface plot
-        fig = go.Figure(
-            data=go.Surface(
-                z=z_values,
-                x=np.round(spot_range, 2),
-                y=np.round(vol_range * 100, 1),
-                colorscale=colorscale,
-                colorbar=dict(title=colorbar_title),
-                hovertemplate="Spot: $%{x}<br>Vol: %{y}%<br>Value: $%{z:.2f}<extra></extra>",
-            )
+
+@st.cache_resource
+def get_archive() -> Archive:
+    # Fine grids on disk, memory-mapped back in, so they outlive the process
+    return Archive()
+
+
+@st.cache_resource(max_entries=8)
+def get_attribution(option_type: str, start: str | None, end: str | None, ranges: tuple, version: tuple) -> AttributionSummary:
+    # Keyed on the history version: any write recomputes, paging and reruns reuse the scan
+    return attribute_history(option_type, ATTRIBUTION_ROWS, start=start, end=end, ranges=dict(ranges))
+
+
+@contextmanager
+def fragment_run(label: str):
+    """
+    Time a fragment as a stage of the full rerun, or as a perf run of its
+    own when the fragment reruns alone.
+    """
+    if perf.current_run() is not None:
+        with perf.stage(label):
+            yield
+        return
+    perf.start_run(label, enabled=st.session_state.get("perf_enabled", False))
+    try:
+        yield
+    finally:
+        run = perf.end_run()
+        if run is not None:
+            st.session_state.setdefault("perf_runs", deque(maxlen=PERF_HISTORY)).append(run)
+
+
+@st.fragment
+def sensitivity_analysis() -> None:
+    # Reruns on its own when a chart control changes; sidebar inputs come from the enclosing run
+    with fragment_run("fragment.sensitivity"):
+        st.markdown("## Sensitivity Analysis")
+
+        style_col, metric_col = st.columns([1, 2])
+        # Chart style selector
+        chart_style = style_col.radio(
+            "Chart Style",
+            options=["2D Heatmap", "3D Surface"],
+            horizontal=True,
+            label_visibility="collapsed",
         )
-        fig.update_layout(
-            title=chart_title,
-            scene=dict(
-                xaxis_title="Spot Price ($)",
-                yaxis_title="Volatility (%)",
-                zaxis_title=colorbar_title,
-                bgcolor="rgba(245, 245, 247, 0.5)",
-            ),
-            height=550,
-            font=dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13),
-            margin=dict(l=0, r=0, t=40, b=0),
-            plot_bgcolor="rgba(255, 255, 255, 0.8)",
-            paper_bgcolor="rgba(245, 245, 247, 0)",
+        # Every metric is stored on the cached grid, so switching only redraws
+        metric_options = [m for m in HEATMAP_METRICS if m != "P&L" or simulate_pnl]
+        metric = metric_col.radio(
+            "Metric",
+            options=metric_options,
+            index=metric_options.index("P&L") if simulate_pnl else 0,
+            horizontal=True,
+            label_visibility="collapsed",
         )
-    else:
-        # 2D Heatmap plot (original)
-        fig = go.Figure(
-            data=go.Heatmap(
-                z=z_values,
-                x=np.round(spot_range, 2),
-                y=np.round(vol_range * 100, 1),
-                colorscale=colorscale,
-                colorbar=dict(title=colorbar_title),
-                hovertemplate="Spot: $%{x}<br>Vol: %{y}%<br>Value: $%{z:.2f}<extra></extra>",
+
+        resolution = st.select_slider(
+            "Grid Resolution",
+            options=RESOLUTIONS,
+            value=100,
+            help="Points per axis. A coarse grid is drawn first, then refined with nodes packed where the surface bends most (near the strike, short expiries).",
+        )
+        if american:
+            # Each American cell is a full lattice, so cap what stays interactive
+            resolution = min(resolution, AMERICAN_MAX_RESOLUTION)
+
+        grid_cache = get_grid_cache()
+        coarse_spec = GridSpec(american=american, lattice_steps=AMERICAN_GRID_STEPS, greeks=True)
+        fine_spec = GridSpec(
+            spot_points=resolution,
+            vol_points=resolution,
+            american=american,
+            lattice_steps=AMERICAN_GRID_STEPS,
+            adaptive=True,
+            dtype="float32",
+            greeks=True,
+        )
+        max_chart_points = MAX_SURFACE_POINTS if chart_style == "3D Surface" else MAX_HEATMAP_POINTS
+
+        heatmap_col1, heatmap_col2 = st.columns(2, gap="large")
+        call_chart, put_chart = heatmap_col1.empty(), heatmap_col2.empty()
+
+        def draw_heatmaps(grid: PriceGrid) -> PriceGrid:
+            shown = grid.downsample(max_chart_points)
+            axes = chart_axes(shown)
+            call_fig = generate_heatmap(shown, "Call", chart_style, metric, purchase_price, axes)
+            put_fig = generate_heatmap(shown, "Put", chart_style, metric, purchase_price, axes)
+            if perf.current_run() is not None:
+                perf.count("heatmap.payload_bytes", payload_bytes(call_fig) + payload_bytes(put_fig))
+            with perf.stage("heatmap.render"):
+                call_chart.plotly_chart(call_fig, use_container_width=True)
+                put_chart.plotly_chart(put_fig, use_container_width=True)
+            return shown
+
+        def price_and_archive(coarse: PriceGrid | None) -> PriceGrid:
+            fine = price_grid(S, K, T, r, sigma, fine_spec, coarse=coarse)
+            with perf.stage("grid.archive_save"):
+                archive.save_grid(S, K, T, r, sigma, fine_spec, fine)
+            return fine
+
+        archive = get_archive()
+        fine_key = (S, K, T, r, sigma, fine_spec)
+        if resolution > coarse_spec.spot_points and fine_key not in grid_cache:
+            with perf.stage("grid.archive_load"):
+                archived = archive.load_grid(S, K, T, r, sigma, fine_spec)
+            if archived is not None:
+                grid_cache.put(fine_key, archived)
+        coarse = None
+        if resolution <= coarse_spec.spot_points or fine_key not in grid_cache:
+            with perf.stage("grid.coarse"):
+                coarse = grid_cache.get_or_compute(
+                    (S, K, T, r, sigma, coarse_spec),
+                    lambda: price_grid(S, K, T, r, sigma, coarse_spec),
+                )
+            grid = coarse
+            shown = draw_heatmaps(coarse)
+        if resolution > coarse_spec.spot_points:
+            with perf.stage("grid.fine"):
+                grid = grid_cache.get_or_compute(
+                    fine_key,
+                    lambda: price_and_archive(coarse),
+                )
+            shown = draw_heatmaps(grid)
+
+        st.caption(f"Computed {grid.shape[1]}×{grid.shape[0]} · displayed {shown.shape[1]}×{shown.shape[0]}")
+        if american:
+            st.caption(
+                f"American cells use a {AMERICAN_GRID_STEPS}-step lattice (within about $0.02 of the headline "
+                f"price's) on at most {AMERICAN_MAX_RESOLUTION} points per axis."
+                + (" Greek surfaces are Black-Scholes (European) values." if metric not in ("Price", "P&L") else "")
             )
+        st.caption(
+            f"Grid cache: {grid_cache.hits} hits · {grid_cache.misses} misses · {len(grid_cache)} grids, {grid_cache.nbytes / 1024**2:.1f}/{GRID_CACHE_BYTES / 1024**2:.0f} MB · "
+            f"archive: {archive.hits} hits · {len(archive)} grids, {archive.size_bytes / 1024**2:.1f}/{archive.max_bytes / 1024**2:.0f} MB"
         )
-        fig.update_layout(
-            title=chart_title,
-            xaxis_title="Spot Price ($)",
-            yaxis_title="Volatility (%)",
-            height=450,
-            font=dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13),
-            margin=dict(l=0, r=0, t=40, b=0),
-            plot_bgcolor="rgba(255, 255, 255, 0.9)",
-            paper_bgcolor="rgba(245, 245, 247, 0)",
+
+
+sensitivity_analysis()
+
+st.markdown("---")
+
+
+@st.fragment
+def history_section() -> None:
+    # Saving or paging reruns only this section, not the charts above
+    with fragment_run("fragment.history"):
+        title_col, button_col = st.columns([4, 1])
+        title_col.markdown("## History")
+        # History records Black-Scholes (European) prices regardless of the toggle;
+        # recalculating stored inputs counts a hit instead of adding a row
+        if button_col.button("Calculate", type="primary", use_container_width=True, help="Save the current inputs and prices to History"):
+            db.save_result(S, K, T, r, sigma, values)
+
+        with st.expander("Filters"):
+            f1, f2, f3 = st.columns(3)
+            dates = f1.date_input("Date Range", value=(), help="Leave empty to show every day")
+            vol_filter = f2.slider("Volatility (%)", 0.0, 200.0, (0.0, 200.0), step=1.0)
+            page_size = f3.selectbox("Rows per Page", [10, 25, 50, 100], index=0)
+
+        start = end = None
+        if len(dates) == 2:
+            start = datetime.combine(dates[0], datetime.min.time()).isoformat()
+            end = datetime.combine(dates[1], datetime.max.time()).isoformat()
+        ranges = {}
+        if vol_filter != (0.0, 200.0):
+            ranges["vol"] = (vol_filter[0] / 100, vol_filter[1] / 100)
+
+        # Keyset pagination: a stack of before_id cursors, one per page we paged past.
+        # Changing the filters starts again from the newest row.
+        filters = (start, end, tuple(ranges.items()), page_size)
+        if st.session_state.get("history_filters") != filters:
+            st.session_state.history_filters = filters
+            st.session_state.history_cursors = []
+        cursors = st.session_state.history_cursors
+
+        def older_page():
+            cursors.append(st.session_state.history_last_id)
+
+        def newer_page():
+            cursors.pop()
+
+        history = db.fetch_page(
+            before_id=cursors[-1] if cursors else None,
+            limit=page_size,
+            start=start,
+            end=end,
+            ranges=ranges,
         )
-    
-    return fig
 
+        if history:
+            # pandas (~0.5 s to import) is loaded only once there is something to tabulate
+            import pandas as pd
 
-st.markdown("## Sensitivity Analysis")
+            st.session_state.history_last_id = history[-1]["id"]
+            df = pd.DataFrame(history).drop(columns="id")
+            df.columns = ["Timestamp", "Spot", "Strike", "Expiry", "Rate", "Vol", "Call", "Put", "Hits"]
+            df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+            df[["Rate", "Vol"]] *= 100
+            st.dataframe(
+                df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Timestamp": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+                    "Spot": st.column_config.NumberColumn(format="$%.2f"),
+                    "Strike": st.column_config.NumberColumn(format="$%.2f"),
+                    "Expiry": st.column_config.NumberColumn(format="%.2f"),
+                    "Rate": st.column_config.NumberColumn(format="%.2f%%"),
+                    "Vol": st.column_config.NumberColumn(format="%.2f%%"),
+                    "Call": st.column_config.NumberColumn(format="$%.4f"),
+                    "Put": st.column_config.NumberColumn(format="$%.4f"),
+                },
+            )
+        elif not cursors:
+            st.info("No calculations yet. Adjust parameters and click Calculate.")
 
-# Chart style selector
-chart_style = st.radio(
-    "Chart Style",
-    options=["2D Heatmap", "3D Surface"],
-    horizontal=True,
-    label_visibility="collapsed",
-)
+        p1, p2, p3 = st.columns([1, 1, 4])
+        p1.button("← Newer", on_click=newer_page, disabled=not cursors, use_container_width=True)
+        p2.button("Older →", on_click=older_page, disabled=len(history) < page_size, use_container_width=True)
+        p3.caption(f"Page {len(cursors) + 1}")
+
+        summary = db.daily_summary(start=start, end=end, ranges=ranges)
+        if summary:
+            import pandas as pd
 
-heatmap_col1, heatmap_col2 = st.columns(2, gap="large")
+            st.markdown("#### Daily Summary")
+            daily = pd.DataFrame(summary)
+            daily["avg_volatility"] *= 100
+            st.dataframe(
+                daily,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "day": st.column_config.TextColumn("Day"),
+                    "calculations": st.column_config.NumberColumn("Calculations"),
+                    "avg_volatility": st.column_config.NumberColumn("Avg Vol", format="%.2f%%"),
+                    "min_call": st.column_config.NumberColumn("Min Call", format="$%.4f"),
+                    "max_call": st.column_config.NumberColumn("Max Call", format="$%.4f"),
+                    "min_put": st.column_config.NumberColumn("Min Put", format="$%.4f"),
+                    "max_put": st.column_config.NumberColumn("Max Put", format="$%.4f"),
+                },
+            )
+
+        with st.expander("P&L Attribution"):
+            a1, a2 = st.columns([1, 3])
+            leg = a1.radio("Leg", ["Call", "Put"], horizontal=True, key="attribution_leg")
+            enabled = a2.toggle(
+                "Attribute price changes",
+                key="attribution_enabled",
+                help="Split each change between consecutive calculations into Greek contributions. "
+                "Scans the whole filtered history once, then again only after new saves.",
+            )
+            if enabled:
+                attribution = get_attribution(leg, start, end, tuple(ranges.items()), db.history_version())
+                if not attribution.intervals:
+                    st.info("Attribution needs at least two calculations.")
+                else:
+                    import pandas as pd
 
-with heatmap_col1:
-    st.plotly_chart(generate_heatmap("Call", chart_style, purchase_price, simulate_pnl), use_container_width=True)
+                    totals = attribution.totals
+                    for col, name in zip(st.columns(len(totals)), totals):
+                        col.metric("Price Change" if name == "change" else name.title(), f"${totals[name]:,.4f}")
+                    st.caption(
+                        f"{attribution.explained:,} of {attribution.intervals:,} consecutive changes explained; "
+                        "changes of strike and rows saved without Greeks are left out. "
+                        "Theta counts the fall in time to expiry as days passed."
+                    )
+                    recent = attribution.recent
+                    table = pd.DataFrame(
+                        {"From": recent.from_id, "To": recent.to_id, "Change": recent.change}
+                        | {name.title(): getattr(recent, name) for name in TERMS}
+                    ).iloc[::-1]
+                    money = st.column_config.NumberColumn(format="$%.4f")
+                    st.dataframe(
+                        table,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={"Change": money} | {name.title(): money for name in TERMS},
+                    )
 
-with heatmap_col2:
-    st.plotly_chart(generate_heatmap("Put", chart_style, purchase_price, simulate_pnl), use_container_width=True)
+
+history_section()
 
 st.markdown("---")
 
-st.markdown("## History")
-history = db.fetch_recent(10)
+run = perf.end_run()
+if profiler is not None:
+    profiler.disable()
 
-if history:
-    df = pd.DataFrame(history)
-    df.columns = ["Timestamp", "Spot", "Strike", "Expiry", "Rate", "Vol", "Call", "Put"]
-    
-    # Format timestamp to YYYY-MM-DD HH:MM
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"]).dt.strftime("%Y-%m-%d %H:%M")
-    
-    df["Rate"] = (df["Rate"] * 100).round(2).astype(str) + "%"
-    df["Vol"] = (df["Vol"] * 100).round(2).astype(str) + "%"
-    df["Call"] = df["Call"].apply(lambda x: f"${x:,.4f}")
-    df["Put"] = df["Put"].apply(lambda x: f"${x:,.4f}")
-    st.dataframe(df, use_container_width=True, hide_index=True)
-else:
-    st.info("No calculations yet. Adjust parameters and click Calculate.")
+with st.expander("Performance"):
+    p1, p2 = st.columns(2)
+    p1.toggle("Record timings", key="perf_enabled", help="Time each stage of every rerun")
+    p2.toggle("Profile reruns", key="perf_profile", help="Run the whole script under cProfile")
+
+    runs = st.session_state.setdefault("perf_runs", deque(maxlen=PERF_HISTORY))
+    if run is not None:
+        runs.append(run)
+    if runs:
+        import pandas as pd
+
+        latest = runs[-1]
+        st.caption(f"Last recorded rerun ({latest.label}): {latest.total * 1e3:.1f} ms (stages can nest, so they may not sum to the total)")
+        stages = pd.DataFrame(
+            {
+                "Stage": list(latest.timings),
+                "Calls": list(latest.calls.values()),
+                "Time (ms)": [seconds * 1e3 for seconds in latest.timings.values()],
+            }
+        ).sort_values("Time (ms)", ascending=False)
+        st.dataframe(
+            stages,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Time (ms)": st.column_config.NumberColumn(format="%.2f")},
+        )
+        if latest.counters:
+            st.caption(" · ".join(f"{name}: {value:,}" for name, value in latest.counters.items()))
+        # Fragment reruns are recorded under their own label
+        recent = pd.DataFrame(
+            [{"Total": past.total, **past.timings} for past in reversed(runs)],
+            index=[past.label for past in reversed(runs)],
+        ) * 1e3
+        st.markdown("#### Recent Reruns (ms)")
+        st.dataframe(recent.round(2), use_container_width=True)
+        st.download_button("Download Timings (JSON)", perf.to_json(runs), file_name="perf.json", mime="application/json")
+    else:
+        st.caption("Turn on Record timings, then interact with the dashboard.")
+
+    if profiler is not None:
+        st.markdown("#### Profile of This Rerun")
+        st.code(perf.profile_summary(profiler), language=None)
+        st.download_button("Download Profile (.prof)", perf.profile_bytes(profiler), file_name="rerun.prof")
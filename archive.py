@@ -0,0 +1,258 @@
+"""
+Memory-mapped columnar archive for price grids and batch results.
+
+Each entry is a directory of .npy files, one per column, named by a hash
+of the entry's kind and input parameters. A small JSON index beside them
+records every entry's parameters, column shapes, size and last use. get()
+opens columns with np.load(mmap_mode="r"), so a surface or a batch of
+millions of rows costs nothing until its pages are actually read, and
+slices of it only read the pages they touch.
+
+The archive is capped at max_bytes; storing past the cap evicts the least
+recently used entries. Reads only update last use in memory; the index is
+written by put() and evict(), by flush(), and at interpreter exit. One
+process should write a given archive directory (the dashboard's sessions
+are threads of one process, which is fine).
+"""
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+from grid import GridSpec, PriceGrid
+from model import Greeks, OptionValues
+
+ARCHIVE_DIR = Path(__file__).parent / "archive"
+INDEX_FILE = "index.json"
+MAX_BYTES = 512 * 1024**2
+
+BATCH_INPUTS = ("S", "K", "T", "r", "sigma")
+
+
+def archive_key(kind: str, params: dict) -> str:
+    """Content address of an entry; params must be JSON-serialisable."""
+    canonical = json.dumps({"kind": kind, "params": params}, sort_keys=True)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _value_columns(call_price, put_price, call: Greeks | None, put: Greeks | None) -> dict[str, np.ndarray]:
+    # Same column names as the calculations table; gamma and vega are shared by both legs
+    columns = {"call_price": call_price, "put_price": put_price}
+    if call is not None:
+        columns.update(
+            call_delta=call.delta,
+            put_delta=put.delta,
+            gamma=call.gamma,
+            vega=call.vega,
+            call_theta=call.theta,
+            put_theta=put.theta,
+            call_rho=call.rho,
+            put_rho=put.rho,
+        )
+    return columns
+
+
+def _greeks(columns: dict[str, np.ndarray], leg: str) -> Greeks | None:
+    if "gamma" not in columns:
+        return None
+    return Greeks(
+        delta=columns[f"{leg}_delta"],
+        gamma=columns["gamma"],
+        theta=columns[f"{leg}_theta"],
+        vega=columns["vega"],
+        rho=columns[f"{leg}_rho"],
+    )
+
+
+class Archive:
+    """
+    A directory of memory-mapped column sets, keyed by archive_key().
+
+    hits and misses count get() lookups, as LRUCache does.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int = MAX_BYTES):
+        self.root = Path(ARCHIVE_DIR if root is None else root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False  # in-memory last use not yet in the index
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            self._entries: dict[str, dict] = json.loads((self.root / INDEX_FILE).read_text())["entries"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self._entries = {}
+        atexit.register(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def put(self, kind: str, params: dict, columns: dict[str, np.ndarray]) -> str | None:
+        """
+        Store columns under (kind, params), replacing any previous entry.
+
+        Returns the key, or None if the entry alone is larger than the cap.
+        """
+        key = archive_key(kind, params)
+        staging = self.root / f".{key}.{os.getpid()}.{threading.get_ident()}"
+        staging.mkdir(parents=True)
+        try:
+            for name, values in columns.items():
+                np.save(staging / f"{name}.npy", np.ascontiguousarray(values))
+            size = sum(path.stat().st_size for path in staging.iterdir())
+            if size > self.max_bytes:
+                return None
+            with self._lock:
+                self._remove(key)
+                # Renaming the finished directory keeps readers from seeing half an entry
+                staging.rename(self.root / key)
+                now = time.time()
+                self._entries[key] = {
+                    "kind": kind,
+                    "params": params,
+                    "columns": {name: [list(np.shape(values)), np.asarray(values).dtype.str] for name, values in columns.items()},
+                    "bytes": size,
+                    "created": now,
+                    "last_used": now,
+                    "hits": 0,
+                }
+                self._evict(self.max_bytes)
+                self._write_index()
+            return key
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def get(self, kind: str, params: dict) -> dict[str, np.ndarray] | None:
+        """Memory-mapped, read-only columns of an entry, or None if it is not stored."""
+        key = archive_key(kind, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                columns = {
+                    # Zero-length arrays cannot be mapped
+                    name: np.load(self.root / key / f"{name}.npy", mmap_mode="r" if np.prod(shape) else None)
+                    for name, (shape, _) in entry["columns"].items()
+                }
+            except (FileNotFoundError, ValueError):
+                # Deleted or damaged behind our back; forget it
+                self.misses += 1
+                self._remove(key)
+                self._write_index()
+                return None
+            self.hits += 1
+            entry["hits"] += 1
+            entry["last_used"] = time.time()
+            # A read should cost no disk write; the index catches up on the next write or flush()
+            self._dirty = True
+            return columns
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Drop least recently used entries until the archive fits max_bytes (default: the cap)."""
+        with self._lock:
+            evicted = self._evict(self.max_bytes if max_bytes is None else max_bytes)
+            if evicted or self._dirty:
+                self._write_index()
+            return evicted
+
+    def clear(self) -> None:
+        self.evict(0)
+
+    def flush(self) -> None:
+        """Write last use recorded by get() since the index was last written."""
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def _evict(self, max_bytes: int) -> int:
+        evicted = 0
+        total = self.size_bytes
+        for key in sorted(self._entries, key=lambda k: self._entries[k]["last_used"]):
+            if total <= max_bytes:
+                break
+            total -= self._entries[key]["bytes"]
+            self._remove(key)
+            evicted += 1
+        return evicted
+
+    def _remove(self, key: str) -> None:
+        # Pages already mapped by readers stay valid after the files are unlinked
+        self._entries.pop(key, None)
+        shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def _write_index(self) -> None:
+        tmp = self.root / f".{INDEX_FILE}.{os.getpid()}"
+        tmp.write_text(json.dumps({"entries": self._entries}))
+        os.replace(tmp, self.root / INDEX_FILE)
+        self._dirty = False
+
+    # Price grids, keyed by the same inputs as price_grid()
+
+    @staticmethod
+    def _grid_params(S: float, K: float, T: float, r: float, sigma: float, spec: GridSpec) -> dict:
+        return {"S": S, "K": K, "T": T, "r": r, "sigma": sigma, "spec": asdict(spec)}
+
+    def save_grid(self, S: float, K: float, T: float, r: float, sigma: float, spec: GridSpec, grid: PriceGrid) -> str | None:
+        columns = {"spot_range": grid.spot_range, "vol_range": grid.vol_range}
+        columns.update(_value_columns(grid.call_prices, grid.put_prices, grid.call_greeks, grid.put_greeks))
+        return self.put("grid", self._grid_params(S, K, T, r, sigma, spec), columns)
+
+    def load_grid(self, S: float, K: float, T: float, r: float, sigma: float, spec: GridSpec) -> PriceGrid | None:
+        columns = self.get("grid", self._grid_params(S, K, T, r, sigma, spec))
+        if columns is None:
+            return None
+        return PriceGrid(
+            spot_range=columns["spot_range"],
+            vol_range=columns["vol_range"],
+            call_prices=columns["call_price"],
+            put_prices=columns["put_price"],
+            call_greeks=_greeks(columns, "call"),
+            put_greeks=_greeks(columns, "put"),
+        )
+
+    # Batch results, keyed by a hash of the input arrays themselves
+
+    @staticmethod
+    def _batch_params(S, K, T, r, sigma) -> tuple[dict, dict[str, np.ndarray]]:
+        inputs = dict(zip(BATCH_INPUTS, np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma)))))
+        digest = hashlib.blake2b(digest_size=16)
+        for values in inputs.values():
+            digest.update(repr(values.shape).encode())
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return {"inputs": digest.hexdigest()}, inputs
+
+    def save_batch(self, S, K, T, r, sigma, values: OptionValues) -> str | None:
+        """Store a BlackScholesBatch(S, K, T, r, sigma).price_all() result with its inputs."""
+        params, inputs = self._batch_params(S, K, T, r, sigma)
+        columns = dict(inputs)
+        columns.update(_value_columns(values.call_price, values.put_price, values.call_greeks, values.put_greeks))
+        return self.put("batch", params, columns)
+
+    def load_batch(self, S, K, T, r, sigma) -> OptionValues | None:
+        params, _ = self._batch_params(S, K, T, r, sigma)
+        columns = self.get("batch", params)
+        if columns is None:
+            return None
+        return OptionValues(
+            call_price=columns["call_price"],
+            put_price=columns["put_price"],
+            call_greeks=_greeks(columns, "call"),
+            put_greeks=_greeks(columns, "put"),
+        )
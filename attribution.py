@@ -0,0 +1,139 @@
+"""
+Greek-based attribution of price changes across the calculation history.
+
+Each pair of consecutive stored calculations (in id order) is explained by
+a second-order Taylor expansion around the earlier row, using the Greeks
+stored with it:
+
+    delta * dS + 1/2 * gamma * dS^2 + vega * dvol + theta * days + rho * drate
+
+Vega and rho are per 1%, so vol and rate changes are taken in points;
+theta is per day, and days is how far time to expiry fell, in calendar
+days. Whatever the expansion misses (cross terms, higher orders, large
+moves) is the residual. A change of strike is not a Taylor move, so those
+intervals, and intervals starting from a row saved without Greeks, are
+left unexplained (NaN) and counted separately.
+
+The history is read CHUNK_ROWS rows at a time and each chunk is attributed
+with array arithmetic, the last row of one chunk carried into the next, so
+millions of rows take one pass in bounded memory.
+"""
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+import database as db
+import perf
+
+CHUNK_ROWS = 100_000
+TERMS = ("delta", "gamma", "vega", "theta", "rho", "residual")
+
+# Columns of the rows attribute() takes, whichever leg they were read for
+ROW_COLUMNS = ("id", "spot", "strike", "expiry", "rate", "vol", "price", "delta", "gamma", "vega", "theta", "rho")
+_COLUMN = {name: i for i, name in enumerate(ROW_COLUMNS)}
+
+
+def history_columns(option_type: str = "Call") -> tuple[str, ...]:
+    """The calculations columns that make up ROW_COLUMNS for one leg."""
+    leg = "call" if option_type == "Call" else "put"
+    return (
+        "id", "spot_price", "strike_price", "time_to_expiry", "risk_free_rate", "volatility",
+        f"{leg}_price", f"{leg}_delta", "gamma", "vega", f"{leg}_theta", f"{leg}_rho",
+    )
+
+
+@dataclass
+class Attribution:
+    """Per-interval attribution; interval i runs from row from_id[i] to row to_id[i]."""
+
+    from_id: np.ndarray
+    to_id: np.ndarray
+    change: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    rho: np.ndarray
+    residual: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.change)
+
+    @property
+    def explained(self) -> np.ndarray:
+        return ~np.isnan(self.residual)
+
+    def tail(self, n: int) -> "Attribution":
+        return Attribution(*(getattr(self, f.name)[max(len(self) - n, 0) :] for f in fields(self)))
+
+    @classmethod
+    def concat(cls, parts: list["Attribution"]) -> "Attribution":
+        return cls(*(np.concatenate([getattr(part, f.name) for part in parts]) for f in fields(cls)))
+
+
+@dataclass
+class AttributionSummary:
+    intervals: int
+    explained: int
+    totals: dict[str, float]  # "change" and each of TERMS, summed over explained intervals
+    recent: Attribution  # the latest intervals, oldest first
+
+
+def attribute(rows: np.ndarray) -> Attribution:
+    """
+    Attribute the price changes between consecutive rows.
+
+    rows is a float array of one leg's history in id order, columns as in
+    ROW_COLUMNS (NaN for missing Greeks); n rows give n - 1 intervals.
+    """
+    prev, cur = rows[:-1], rows[1:]
+
+    def diff(name: str) -> np.ndarray:
+        return cur[:, _COLUMN[name]] - prev[:, _COLUMN[name]]
+
+    def greek(name: str) -> np.ndarray:
+        return prev[:, _COLUMN[name]]
+
+    d_spot = diff("spot")
+    change = diff("price")
+    terms = np.stack(
+        [
+            greek("delta") * d_spot,
+            0.5 * greek("gamma") * d_spot**2,
+            greek("vega") * diff("vol") * 100,
+            greek("theta") * -diff("expiry") * 365,
+            greek("rho") * diff("rate") * 100,
+        ]
+    )
+    terms[:, diff("strike") != 0] = np.nan
+    residual = change - terms.sum(axis=0)
+    ids = rows[:, _COLUMN["id"]].astype(np.int64)
+    return Attribution(ids[:-1], ids[1:], change, *terms, residual)
+
+
+@perf.timed("attribution")
+def attribute_history(
+    option_type: str = "Call",
+    recent: int = 50,
+    chunk_rows: int = CHUNK_ROWS,
+    start: str | None = None,
+    end: str | None = None,
+    ranges: dict[str, tuple[float, float]] | None = None,
+) -> AttributionSummary:
+    """Attribute every consecutive price change in the (filtered) history in one chunked pass."""
+    totals = np.zeros(len(TERMS) + 1)
+    intervals = explained = 0
+    latest = attribute(np.empty((0, len(ROW_COLUMNS))))
+    previous = None
+    for chunk in db.history_chunks(history_columns(option_type), chunk_rows, start, end, ranges):
+        rows = np.array(chunk, dtype=float)
+        if previous is not None:
+            rows = np.concatenate([previous, rows])
+        previous = rows[-1:]
+        part = attribute(rows)
+        ok = part.explained
+        totals += [part.change[ok].sum(), *(getattr(part, term)[ok].sum() for term in TERMS)]
+        intervals += len(part)
+        explained += int(ok.sum())
+        latest = Attribution.concat([latest, part]).tail(recent)
+    return AttributionSummary(intervals, explained, dict(zip(("change", *TERMS), totals.tolist())), latest)
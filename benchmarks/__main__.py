@@ -0,0 +1,64 @@
+"""
+Run the benchmark suite and optionally compare against a stored baseline.
+
+    python -m benchmarks                         # run everything
+    python -m benchmarks --only model,grid --quick
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks --save-baseline         # overwrite the baseline
+
+Exits with status 1 if any benchmark's p50 latency regresses by more than
+the threshold relative to the baseline.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.harness import compare, load_results, write_results
+from benchmarks.suite import GROUPS
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Options dashboard benchmarks")
+    parser.add_argument("--only", help=f"comma-separated groups ({', '.join(GROUPS)})")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller databases")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"), help="where to write results JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown before failing (0.10 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to the baseline path as well")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(GROUPS)
+    unknown = set(names) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown benchmark group(s): {', '.join(sorted(unknown))}")
+
+    results: dict[str, dict] = {}
+    print(f"{'benchmark':<40}{'ops/sec':>14}{'p50 (us)':>14}{'p99 (us)':>14}")
+    for name in names:
+        for bench, stats in GROUPS[name](quick=args.quick).items():
+            results[bench] = stats
+            print(f"{bench:<40}{stats['ops_per_sec']:>14,.1f}{stats['p50_us']:>14,.1f}{stats['p99_us']:>14,.1f}")
+
+    write_results(args.output, results)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    rows = compare(results, load_results(args.baseline), args.threshold)
+    print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"  {row['name']:<40}{row['ratio']:>8.2f}x  {flag}")
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import json
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+
+def measure(fn: Callable[[], object], repeat: int = 200, warmup: int = 5, setup: Callable[[], object] | None = None) -> dict:
+    """
+    Time repeated calls of fn and summarise the per-call latency.
+
+    setup, if given, runs untimed before every call.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fn()
+
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        fn()
+        samples[i] = time.perf_counter_ns() - start
+
+    samples_us = samples / 1e3
+    return {
+        "ops_per_sec": float(1e6 / samples_us.mean()),
+        "mean_us": float(samples_us.mean()),
+        "p50_us": float(np.percentile(samples_us, 50)),
+        "p99_us": float(np.percentile(samples_us, 99)),
+        "repeat": repeat,
+    }
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def write_results(path: Path, results: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2))
+
+
+def load_results(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text())["results"]
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[dict]:
+    """
+    Compare p50 latency against a baseline.
+
+    Returns one row per benchmark present in both, with ratio = current /
+    baseline and regressed = ratio > 1 + threshold.
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        ratio = current["p50_us"] / baseline[name]["p50_us"]
+        rows.append({
+            "name": name,
+            "baseline_p50_us": baseline[name]["p50_us"],
+            "p50_us": current["p50_us"],
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
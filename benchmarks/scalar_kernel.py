@@ -0,0 +1,78 @@
+"""
+Compare the pure-math scalar kernel against the scipy/NumPy path.
+
+Run from the repository root:
+
+    python -m benchmarks.scalar_kernel
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from model import BlackScholes, OptionValues
+
+FIELDS = ("delta", "gamma", "theta", "vega", "rho")
+
+
+def _flatten(values: OptionValues) -> np.ndarray:
+    return np.array(
+        [values.call_price, values.put_price]
+        + [getattr(values.call_greeks, f) for f in FIELDS]
+        + [getattr(values.put_greeks, f) for f in FIELDS],
+        dtype=float,
+    )
+
+
+def _four_calls(bs: BlackScholes) -> None:
+    bs.call_price()
+    bs.put_price()
+    bs.call_greeks()
+    bs.put_greeks()
+
+
+def max_disagreement(samples: int = 20_000, seed: int = 0) -> tuple[float, float]:
+    """Return (max absolute, max relative for |value| > 1e-6) differences."""
+    rng = np.random.default_rng(seed)
+    worst_abs = worst_rel = 0.0
+    for _ in range(samples):
+        S = 100.0
+        K = float(S / np.exp(rng.uniform(np.log(0.2), np.log(5.0))))
+        T = float(np.exp(rng.uniform(np.log(1e-3), np.log(30.0))))
+        r = float(rng.uniform(0.0, 0.1))
+        sigma = float(np.exp(rng.uniform(np.log(1e-3), np.log(3.0))))
+
+        fast = _flatten(BlackScholes(S, K, T, r, sigma).price_all())
+        ref = _flatten(BlackScholes(*map(np.float64, (S, K, T, r, sigma))).price_all())
+        diff = np.abs(fast - ref)
+        worst_abs = max(worst_abs, diff.max())
+        large = np.abs(ref) > 1e-6
+        if large.any():
+            worst_rel = max(worst_rel, (diff[large] / np.abs(ref[large])).max())
+    return worst_abs, worst_rel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="calls per timing")
+    args = parser.parse_args()
+
+    fast_args = (100.0, 100.0, 1.0, 0.05, 0.2)
+    scipy_args = tuple(np.float64(x) for x in fast_args)
+    cases = {
+        "price_all()": lambda a: BlackScholes(*a).price_all(),
+        "4 separate calls": lambda a: _four_calls(BlackScholes(*a)),
+    }
+
+    print(f"{'case':<20}{'scipy (us)':>12}{'math (us)':>12}{'speedup':>10}")
+    for name, fn in cases.items():
+        t_scipy = timeit.timeit(lambda: fn(scipy_args), number=args.number) / args.number
+        t_fast = timeit.timeit(lambda: fn(fast_args), number=args.number) / args.number
+        print(f"{name:<20}{t_scipy * 1e6:>12.2f}{t_fast * 1e6:>12.2f}{t_scipy / t_fast:>9.1f}x")
+
+    worst_abs, worst_rel = max_disagreement()
+    print(f"\nmax |math - scipy|: {worst_abs:.2e} absolute, {worst_rel:.2e} relative (|value| > 1e-6)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure dashboard cold start and warm rerun times.
+
+Each sample runs app.py under Streamlit's AppTest in a fresh interpreter:
+the first run pays for importing the app's modules and warming caches,
+later runs are what every widget interaction costs. The history database
+is a fresh temporary file unless --db is given, and the grid archive is
+always a fresh temporary directory. Run from the repository
+root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --samples 5 --importtime --db calculations.db
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Imports the dashboard may pull in; the report says which a cold run loaded
+HEAVY_MODULES = ("pandas", "plotly.graph_objects", "pyarrow", "scipy.special", "scipy.stats", "scipy.optimize")
+APP_MODULES = ("numpy", "pandas", "plotly.graph_objects", "model", "grid", "implied_vol", "vol_surface", "database")
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import = time.perf_counter() - start
+at = AppTest.from_file("app.py", default_timeout=120)
+start = time.perf_counter()
+import archive, database
+archive.ARCHIVE_DIR = {archive!r}
+database.DB_PATH = {db!r}
+at.run()
+cold = time.perf_counter() - start
+warm = []
+for _ in range({reruns}):
+    start = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - start)
+print(json.dumps({{
+    "streamlit_import": streamlit_import,
+    "cold": cold,
+    "warm": warm,
+    "errors": len(at.exception),
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def sample(reruns: int, db: Path | None = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(db).resolve() if db else Path(tmp) / "startup.db")
+        code = _CHILD.format(reruns=reruns, heavy=HEAVY_MODULES, db=db_path, archive=str(Path(tmp) / "archive"))
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def import_times(modules: tuple[str, ...] = APP_MODULES) -> dict[str, float]:
+    """Cumulative import seconds per module, imported in order in one fresh interpreter."""
+    code = "; ".join(f"import {name}" for name in modules)
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in out.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip() in modules and not fields[2].startswith("  "):
+            times[fields[2].strip()] = int(fields[1]) / 1e6
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=3, help="fresh interpreters to start")
+    parser.add_argument("--reruns", type=int, default=5, help="warm reruns per interpreter")
+    parser.add_argument("--db", type=Path, help="history database to read (default: an empty temporary one)")
+    parser.add_argument("--importtime", action="store_true", help="also break down import time per module")
+    args = parser.parse_args()
+
+    samples = [sample(args.reruns, args.db) for _ in range(args.samples)]
+    if any(s["errors"] for s in samples):
+        sys.exit("app.py raised an exception under AppTest")
+
+    cold = statistics.median(s["cold"] for s in samples)
+    warm = statistics.median(t for s in samples for t in s["warm"])
+    streamlit_import = statistics.median(s["streamlit_import"] for s in samples)
+    print(f"{'streamlit import':<24}{streamlit_import * 1e3:>10.0f} ms")
+    print(f"{'cold start (first run)':<24}{cold * 1e3:>10.0f} ms")
+    print(f"{'warm rerun':<24}{warm * 1e3:>10.0f} ms")
+    print(f"\nloaded by a cold run: {', '.join(samples[0]['loaded']) or 'none of ' + ', '.join(HEAVY_MODULES)}")
+
+    if args.importtime:
+        print(f"\n{'module':<24}{'import (ms)':>12}")
+        for name, seconds in import_times().items():
+            print(f"{name:<24}{seconds * 1e3:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
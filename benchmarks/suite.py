@@ -0,0 +1,124 @@
+import itertools
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import database as db
+from attribution import attribute_history
+from charts import chart_axes, generate_heatmap, payload_bytes
+from grid import GridSpec, price_grid
+from model import BlackScholes
+from benchmarks.harness import measure
+
+GRID_SIZES = (25, 100, 500)
+CHART_SIZES = (25, 100, 200)
+DB_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_DB_SIZES = (1_000, 10_000)
+
+
+def bench_model(quick: bool = False) -> dict[str, dict]:
+    repeat = 2_000 if quick else 20_000
+    args = (100.0, 100.0, 1.0, 0.05, 0.2)
+    results = {}
+
+    def separate() -> None:
+        bs = BlackScholes(*args)
+        bs.call_price()
+        bs.put_price()
+        bs.call_greeks()
+        bs.put_greeks()
+
+    results["model.call_price"] = measure(lambda: BlackScholes(*args).call_price(), repeat)
+    results["model.call_greeks"] = measure(lambda: BlackScholes(*args).call_greeks(), repeat)
+    results["model.separate_calls"] = measure(separate, repeat)
+    results["model.price_all"] = measure(lambda: BlackScholes(*args).price_all(), repeat)
+    return results
+
+
+def bench_grid(quick: bool = False) -> dict[str, dict]:
+    results = {}
+    for n in GRID_SIZES:
+        spec = GridSpec(spot_points=n, vol_points=n)
+        repeat = max(5, 200_000 // (n * n))
+        if quick:
+            repeat = max(3, repeat // 10)
+        results[f"grid.price_grid.{n}x{n}"] = measure(
+            lambda: price_grid(100.0, 100.0, 1.0, 0.05, 0.2, spec), repeat, warmup=2
+        )
+    return results
+
+
+def _fill(rows: int, batch: int = 100_000) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        params = rng.uniform([50, 50, 0.1, 0.0, 0.05, 0, 0], [150, 150, 2, 0.1, 0.8, 50, 50], size=(n, 7))
+        db.save_calculations(params.tolist())
+
+
+def bench_database(quick: bool = False) -> dict[str, dict]:
+    results = {}
+    bulk = [(100.0, 100.0, 1.0, 0.05, 0.2, 10.45, 5.57)] * 1_000
+    # Spots no filled row has, so every insert benchmark call adds new rows
+    fresh = itertools.count()
+
+    def new_row() -> tuple:
+        return (1_000.0 + next(fresh) * 0.01, 100.0, 1.0, 0.05, 0.2, 10.45, 5.57)
+
+    original_path, original_retention = db.DB_PATH, db.RETENTION_ROWS
+    # Keep every filled row so each size is measured at its nominal table size
+    db.RETENTION_ROWS = None
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for rows in QUICK_DB_SIZES if quick else DB_SIZES:
+                db.DB_PATH = Path(tmp) / f"bench_{rows}.db"
+                db.init_db()
+                _fill(rows)
+                results[f"database.save_calculation.{rows}"] = measure(lambda: db.save_calculation(*new_row()), repeat=200)
+                results[f"database.save_calculations_1000.{rows}"] = measure(
+                    lambda: db.save_calculations([new_row() for _ in range(1_000)]), repeat=20
+                )
+                # Repeats of a stored input set only bump its hit count
+                results[f"database.save_calculation_hit.{rows}"] = measure(
+                    lambda: db.save_calculation(100.0, 100.0, 1.0, 0.05, 0.2, 10.45, 5.57), repeat=200
+                )
+                results[f"database.save_calculations_1000_hit.{rows}"] = measure(
+                    lambda: db.save_calculations(bulk), repeat=20
+                )
+                results[f"database.lookup.{rows}"] = measure(lambda: db.lookup(100.0, 100.0, 1.0, 0.05, 0.2), repeat=200)
+                results[f"database.fetch_recent.{rows}"] = measure(lambda: db.fetch_recent(10), repeat=200)
+                # A keyset page halfway back should cost the same as fetch_recent
+                deep = rows // 2
+                results[f"database.fetch_page_deep.{rows}"] = measure(lambda: db.fetch_page(deep, 10), repeat=200)
+                results[f"database.daily_summary.{rows}"] = measure(db.daily_summary, repeat=10)
+                # A full chunked pass over the history, as the History attribution does once per write
+                results[f"database.attribute_history.{rows}"] = measure(attribute_history, repeat=3)
+        finally:
+            db.DB_PATH, db.RETENTION_ROWS = original_path, original_retention
+            db.close()
+    return results
+
+
+def bench_charts(quick: bool = False) -> dict[str, dict]:
+    """Build and serialize a call/put heatmap pair, as one chart redraw does."""
+    results = {}
+    for n in CHART_SIZES:
+        grid = price_grid(100.0, 100.0, 1.0, 0.05, 0.2, GridSpec(n, n, dtype="float32", greeks=True))
+
+        def redraw() -> int:
+            axes = chart_axes(grid)
+            return sum(payload_bytes(generate_heatmap(grid, leg, "2D Heatmap", "Delta", axes=axes)) for leg in ("Call", "Put"))
+
+        stats = measure(redraw, repeat=20 if quick else 100)
+        stats["payload_bytes"] = redraw()
+        results[f"charts.heatmap_pair.{n}x{n}"] = stats
+    return results
+
+
+GROUPS = {
+    "model": bench_model,
+    "grid": bench_grid,
+    "database": bench_database,
+    "charts": bench_charts,
+}
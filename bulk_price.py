@@ -0,0 +1,161 @@
+"""
+Price large option-chain files offline with vectorized Black-Scholes.
+
+The input (CSV or Parquet) must have columns S, K, T, r and sigma; any other
+columns are passed through unchanged. It is read in fixed-size chunks, so
+memory use is bounded by --chunk-size regardless of file size, and each
+chunk is written out as soon as it is priced.
+
+    python bulk_price.py chain.csv priced.csv
+    python bulk_price.py chain.parquet priced.parquet --chunk-size 500000 --workers 4
+    python bulk_price.py chain.csv priced.csv --record    # also save to the history table
+"""
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from model import BlackScholesBatch, Greeks, OptionValues
+
+INPUT_COLUMNS = ["S", "K", "T", "r", "sigma"]
+
+
+def price_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in INPUT_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"input is missing required column(s): {', '.join(missing)}")
+
+    values = BlackScholesBatch(*(chunk[c].to_numpy(dtype=float) for c in INPUT_COLUMNS)).price_all()
+    call, put = values.call_greeks, values.put_greeks
+    return chunk.assign(
+        call_price=values.call_price,
+        put_price=values.put_price,
+        call_delta=call.delta,
+        put_delta=put.delta,
+        gamma=call.gamma,
+        vega=call.vega,
+        call_theta=call.theta,
+        put_theta=put.theta,
+        call_rho=call.rho,
+        put_rho=put.rho,
+    )
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Append priced chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_csv_header = False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode="a" if self._wrote_csv_header else "w", header=not self._wrote_csv_header, index=False)
+            self._wrote_csv_header = True
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def _record(chunk: pd.DataFrame) -> None:
+    import database as db
+
+    # Save the Greeks price_chunk() already computed, so P&L attribution covers these rows
+    names = INPUT_COLUMNS + ["call_price", "put_price"] + list(db.GREEK_COLUMNS)
+    column = {name: chunk[name].to_numpy(dtype=float) for name in names}
+    values = OptionValues(
+        call_price=column["call_price"],
+        put_price=column["put_price"],
+        call_greeks=Greeks(column["call_delta"], column["gamma"], column["call_theta"], column["vega"], column["call_rho"]),
+        put_greeks=Greeks(column["put_delta"], column["gamma"], column["put_theta"], column["vega"], column["put_rho"]),
+    )
+    db.save_results(*(column[c] for c in INPUT_COLUMNS), values)
+
+
+def run(
+    input_path: Path,
+    output_path: Path,
+    chunk_size: int = 100_000,
+    workers: int = 0,
+    record: bool = False,
+    progress: bool = True,
+) -> int:
+    """Price input_path into output_path and return the number of rows priced."""
+    writer = ChunkWriter(output_path)
+    start = time.perf_counter()
+    rows = 0
+
+    def finish(priced: pd.DataFrame) -> None:
+        nonlocal rows
+        writer.write(priced)
+        if record:
+            _record(priced)
+        rows += len(priced)
+        if progress:
+            elapsed = time.perf_counter() - start
+            print(f"\r{rows:,} rows  {rows / elapsed:,.0f} rows/sec", end="", file=sys.stderr)
+
+    try:
+        if workers > 0:
+            # Keep a bounded number of chunks in flight and write them in input order
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending: deque[Future] = deque()
+                for chunk in read_chunks(input_path, chunk_size):
+                    pending.append(pool.submit(price_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        finish(pending.popleft().result())
+                while pending:
+                    finish(pending.popleft().result())
+        else:
+            for chunk in read_chunks(input_path, chunk_size):
+                finish(price_chunk(chunk))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    if progress:
+        print(f"\nPriced {rows:,} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV or .parquet file with S, K, T, r, sigma columns")
+    parser.add_argument("output", type=Path, help="CSV or .parquet file to write")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows per chunk (bounds memory)")
+    parser.add_argument("--workers", type=int, default=0, help="price chunks in this many processes (0 = in-process)")
+    parser.add_argument("--record", action="store_true", help="bulk-save priced rows to the calculations table")
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.output, args.chunk_size, args.workers, args.record, progress=not args.quiet)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit/miss counters.
+
+    Holds at most maxsize entries and, when max_bytes is given, at most
+    max_bytes as measured by sizeof(value); a value larger than max_bytes
+    on its own is not kept. Safe to share between Streamlit sessions,
+    which run in separate threads.
+    """
+
+    def __init__(self, maxsize: int = 64, max_bytes: int | None = None, sizeof: Callable[[object], int] | None = None):
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("max_bytes needs a sizeof function")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sizeof = sizeof
+        self._sizes: dict = {}
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            if self._sizeof is not None:
+                size = self._sizeof(value)
+                self.nbytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while self._data and (
+                len(self._data) > self.maxsize or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            ):
+                evicted, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted, 0)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        # Compute outside the lock so a slow miss does not block other sessions
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
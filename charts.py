@@ -0,0 +1,101 @@
+"""
+Plotly figure specs for the dashboard's sensitivity charts.
+
+Figures are built as plain dicts. st.plotly_chart validates them into a
+Figure once, so building a go.Figure here as well would double that cost.
+Chart data is sent compactly:
+- Surfaces are rounded to the precision their hover labels show and sent
+  as float32, which Plotly serializes as base64 binary at 4 bytes a
+  value. Rounded values also compress well over a compressing websocket.
+- The spot and vol axes are rounded once per grid and shared by the call
+  and put charts.
+- The Plotly default template is left out; Streamlit's theme replaces it
+  in the browser anyway.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import perf
+from grid import PriceGrid
+
+# Heatmap metric -> (PriceGrid.surface name, colorbar title, value prefix, decimals shown)
+HEATMAP_METRICS = {
+    "Price": ("price", "Price ($)", "$", 2),
+    "P&L": ("price", "P&L ($)", "$", 2),
+    "Delta": ("delta", "Delta", "", 3),
+    "Gamma": ("gamma", "Gamma", "", 4),
+    "Vega": ("vega", "Vega ($ per 1%)", "", 3),
+    "Theta": ("theta", "Theta ($ per day)", "", 4),
+    "Rho": ("rho", "Rho ($ per 1%)", "", 3),
+}
+FONT = dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13)
+
+
+def quantize(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Round to the displayed precision and narrow to float32 for the wire."""
+    return np.round(values, decimals).astype(np.float32)
+
+
+def chart_axes(grid: PriceGrid) -> tuple[np.ndarray, np.ndarray]:
+    """Spot ($, 2 dp) and vol (%, 1 dp) axes of a grid, ready to share between charts."""
+    return quantize(grid.spot_range, 2), quantize(grid.vol_range * 100, 1)
+
+
+@perf.timed("heatmap.figure")
+def generate_heatmap(
+    grid: PriceGrid,
+    option_type: str,
+    chart_style: str,
+    metric: str = "Price",
+    purchase_price: float | None = None,
+    axes: tuple[np.ndarray, np.ndarray] | None = None,
+) -> dict:
+    spot_axis, vol_axis = chart_axes(grid) if axes is None else axes
+    surface, colorbar_title, prefix, decimals = HEATMAP_METRICS[metric]
+
+    # Calculate Z-values (P&L is price less the purchase price)
+    z_values = grid.surface(option_type, surface)
+    if metric == "P&L":
+        z_values = z_values - purchase_price
+
+    trace = dict(
+        type="surface" if chart_style == "3D Surface" else "heatmap",
+        z=quantize(z_values, decimals),
+        x=spot_axis,
+        y=vol_axis,
+        colorscale="RdYlGn" if metric == "P&L" else "Viridis",
+        colorbar=dict(title=dict(text=colorbar_title)),
+        hovertemplate=f"Spot: $%{{x}}<br>Vol: %{{y}}%<br>{metric}: {prefix}%{{z:.{decimals}f}}<extra></extra>",
+    )
+    layout = dict(
+        title=dict(text=f"{option_type} {metric} Sensitivity"),
+        font=FONT,
+        margin=dict(l=0, r=0, t=40, b=0),
+        paper_bgcolor="rgba(245, 245, 247, 0)",
+        template={},
+    )
+    if chart_style == "3D Surface":
+        layout.update(
+            scene=dict(
+                xaxis=dict(title=dict(text="Spot Price ($)")),
+                yaxis=dict(title=dict(text="Volatility (%)")),
+                zaxis=dict(title=dict(text=colorbar_title)),
+                bgcolor="rgba(245, 245, 247, 0.5)",
+            ),
+            height=550,
+            plot_bgcolor="rgba(255, 255, 255, 0.8)",
+        )
+    else:
+        layout.update(
+            xaxis=dict(title=dict(text="Spot Price ($)")),
+            yaxis=dict(title=dict(text="Volatility (%)")),
+            height=450,
+            plot_bgcolor="rgba(255, 255, 255, 0.9)",
+        )
+    return dict(data=[trace], layout=layout)
+
+
+def payload_bytes(figure: dict) -> int:
+    """Size of the JSON spec st.plotly_chart sends for a figure."""
+    return len(pio.to_json(go.Figure(figure), validate=False))
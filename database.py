@@ -1,29 +1,194 @@
+import atexit
+import hashlib
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import perf
+from model import Greeks, OptionValues
 
 DB_PATH = Path(__file__).parent / "calculations.db"
 
+# Inputs are rounded to this many significant digits before hashing, so
+# float noise in the last bits still maps to the same stored result
+HASH_DIGITS = 10
+
+# Least recently used rows beyond RETENTION_ROWS are evicted, checked once
+# every PRUNE_INTERVAL saves. None keeps everything.
+RETENTION_ROWS: int | None = 1_000_000
+PRUNE_INTERVAL = 10_000
+
+# Applied to every new connection. WAL lets dashboard sessions read while
+# another writes; synchronous=NORMAL is durable across crashes in WAL mode.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",  # 16 MB page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA busy_timeout = 5000",
+)
+
+# MIGRATIONS[i] upgrades the schema from version i to i + 1, tracked in
+# PRAGMA user_version. Append new steps; never edit an existing one.
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    (
+        """
+        CREATE TABLE IF NOT EXISTS calculations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            spot_price REAL NOT NULL,
+            strike_price REAL NOT NULL,
+            time_to_expiry REAL NOT NULL,
+            risk_free_rate REAL NOT NULL,
+            volatility REAL NOT NULL,
+            call_price REAL NOT NULL,
+            put_price REAL NOT NULL
+        )
+        """,
+    ),
+    (
+        "CREATE INDEX IF NOT EXISTS idx_calculations_timestamp ON calculations (timestamp)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_calculations_params ON calculations (
+            spot_price, strike_price, time_to_expiry, risk_free_rate, volatility
+        )
+        """,
+    ),
+    (
+        # Covers daily_summary(): groups read in day order straight off the index
+        """
+        CREATE INDEX IF NOT EXISTS idx_calculations_day ON calculations (
+            substr(timestamp, 1, 10), volatility, call_price, put_price
+        )
+        """,
+    ),
+    (
+        "ALTER TABLE calculations ADD COLUMN params_hash TEXT",
+        "ALTER TABLE calculations ADD COLUMN hit_count INTEGER NOT NULL DEFAULT 1",
+        "ALTER TABLE calculations ADD COLUMN last_used TEXT",
+        "ALTER TABLE calculations ADD COLUMN call_delta REAL",
+        "ALTER TABLE calculations ADD COLUMN put_delta REAL",
+        "ALTER TABLE calculations ADD COLUMN gamma REAL",
+        "ALTER TABLE calculations ADD COLUMN vega REAL",
+        "ALTER TABLE calculations ADD COLUMN call_theta REAL",
+        "ALTER TABLE calculations ADD COLUMN put_theta REAL",
+        "ALTER TABLE calculations ADD COLUMN call_rho REAL",
+        "ALTER TABLE calculations ADD COLUMN put_rho REAL",
+        """
+        UPDATE calculations SET
+            params_hash = params_hash(spot_price, strike_price, time_to_expiry, risk_free_rate, volatility),
+            last_used = timestamp
+        """,
+        # Fold existing duplicates into their newest row before enforcing uniqueness
+        """
+        CREATE TEMP TABLE duplicates AS
+        SELECT MAX(id) AS keep, COUNT(*) AS hits FROM calculations GROUP BY params_hash
+        """,
+        "DELETE FROM calculations WHERE id NOT IN (SELECT keep FROM duplicates)",
+        "UPDATE calculations SET hit_count = d.hits FROM duplicates AS d WHERE d.keep = calculations.id",
+        "DROP TABLE duplicates",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_calculations_hash ON calculations (params_hash)",
+        "CREATE INDEX IF NOT EXISTS idx_calculations_last_used ON calculations (last_used)",
+    ),
+)
+
+GREEK_COLUMNS = ("call_delta", "put_delta", "gamma", "vega", "call_theta", "put_theta", "call_rho", "put_rho")
+
+# A repeat of a stored input set bumps its hit count and moves its timestamp
+# to the recalculation instead of adding a row, so History and the daily
+# summary show when it was last calculated
+UPSERT_SQL = f"""
+    INSERT INTO calculations (
+        timestamp, spot_price, strike_price, time_to_expiry, risk_free_rate, volatility,
+        call_price, put_price, {", ".join(GREEK_COLUMNS)}, params_hash, last_used
+    )
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, ?12, ?13, ?14, ?15, ?16,
+            params_hash(?2, ?3, ?4, ?5, ?6), ?1)
+    ON CONFLICT (params_hash) DO UPDATE SET
+        hit_count = hit_count + 1,
+        timestamp = excluded.timestamp,
+        last_used = excluded.last_used,
+        {", ".join(f"{c} = coalesce({c}, excluded.{c})" for c in GREEK_COLUMNS)}
+"""
+
+_lock = threading.RLock()
+_connection: sqlite3.Connection | None = None
+_connection_path: Path | None = None
+_saves_since_prune = 0
+
+
+def params_hash(S: float, K: float, T: float, r: float, sigma: float) -> str:
+    """Content address of an input set; also registered as an SQL function."""
+    # + 0.0 folds -0.0 into 0.0
+    canonical = "|".join(f"{float(x) + 0.0:.{HASH_DIGITS}g}" for x in (S, K, T, r, sigma))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
 
 def get_connection() -> sqlite3.Connection:
-    return sqlite3.connect(DB_PATH)
+    """
+    Return the process-wide connection, opening and migrating it on first use.
+
+    The connection is shared between Streamlit sessions (threads), so callers
+    should go through _transaction(), which serialises access.
+    """
+    global _connection, _connection_path
+    with _lock:
+        if _connection is not None and _connection_path == DB_PATH:
+            return _connection
+        close()
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        conn.create_function("params_hash", 5, params_hash, deterministic=True)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        _migrate(conn)
+        _connection, _connection_path = conn, DB_PATH
+        return conn
+
+
+def close() -> None:
+    global _connection, _connection_path
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+        _connection, _connection_path = None, None
+
+
+atexit.register(close)
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    with _lock:
+        conn = get_connection()
+        with conn:
+            yield conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock: another process may have migrated
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {target}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
 
 
 def init_db() -> None:
-    with get_connection() as conn:
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS calculations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                spot_price REAL NOT NULL,
-                strike_price REAL NOT NULL,
-                time_to_expiry REAL NOT NULL,
-                risk_free_rate REAL NOT NULL,
-                volatility REAL NOT NULL,
-                call_price REAL NOT NULL,
-                put_price REAL NOT NULL
-            )
-        """)
+    """Create or upgrade the schema. Safe to call any number of times."""
+    get_connection()
 
 
 def save_calculation(
@@ -35,32 +200,108 @@ def save_calculation(
     call_price: float,
     put_price: float,
 ) -> None:
-    with get_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO calculations 
-            (timestamp, spot_price, strike_price, time_to_expiry, risk_free_rate, volatility, call_price, put_price)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                datetime.now().isoformat(timespec="seconds"),
-                S,
-                K,
-                T,
-                r,
-                sigma,
-                call_price,
-                put_price,
-            ),
+    save_calculations([(S, K, T, r, sigma, call_price, put_price)])
+
+
+@perf.timed()
+def save_result(S: float, K: float, T: float, r: float, sigma: float, values: OptionValues) -> None:
+    """Store prices and Greeks so lookup() can serve this input set later."""
+    call, put = values.call_greeks, values.put_greeks
+    greeks = (call.delta, put.delta, call.gamma, call.vega, call.theta, put.theta, call.rho, put.rho)
+    _save_rows([(S, K, T, r, sigma, values.call_price, values.put_price, *greeks)])
+
+
+@perf.timed()
+def save_results(S, K, T, r, sigma, values: OptionValues) -> int:
+    """Bulk save_result() over equal-length sequences, e.g. a BlackScholesBatch.price_all()."""
+    call, put = values.call_greeks, values.put_greeks
+    return _save_rows(
+        zip(
+            S, K, T, r, sigma,
+            values.call_price, values.put_price,
+            call.delta, put.delta, call.gamma, call.vega, call.theta, put.theta, call.rho, put.rho,
         )
+    )
+
+
+@perf.timed()
+def save_calculations(rows: Iterable[tuple[float, float, float, float, float, float, float]]) -> int:
+    """
+    Bulk-save (S, K, T, r, sigma, call_price, put_price) rows in one transaction.
+
+    Rows whose inputs are already stored count a hit on the existing row.
+    Returns the number of rows saved, new or repeat.
+    """
+    return _save_rows(row + (None,) * len(GREEK_COLUMNS) for row in map(tuple, rows))
+
+
+def _save_rows(rows: Iterable[tuple]) -> int:
+    global _saves_since_prune
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    with _transaction() as conn:
+        cursor = conn.executemany(
+            UPSERT_SQL,
+            ((timestamp, *(None if x is None else float(x) for x in row)) for row in rows),
+        )
+        _saves_since_prune += cursor.rowcount
+        if RETENTION_ROWS is not None and _saves_since_prune >= PRUNE_INTERVAL:
+            _saves_since_prune = 0
+            _prune(conn, RETENTION_ROWS)
+        return cursor.rowcount
+
+
+@perf.timed()
+def lookup(S: float, K: float, T: float, r: float, sigma: float) -> OptionValues | None:
+    """Stored prices and Greeks for this input set, or None if never saved with Greeks."""
+    with _transaction() as conn:
+        row = conn.execute(
+            f"""
+            SELECT call_price, put_price, {", ".join(GREEK_COLUMNS)}
+            FROM calculations
+            WHERE params_hash = ? AND call_delta IS NOT NULL
+            """,
+            (params_hash(S, K, T, r, sigma),),
+        ).fetchone()
+    if row is None:
+        return None
+    return OptionValues(
+        call_price=row["call_price"],
+        put_price=row["put_price"],
+        call_greeks=Greeks(row["call_delta"], row["gamma"], row["call_theta"], row["vega"], row["call_rho"]),
+        put_greeks=Greeks(row["put_delta"], row["gamma"], row["put_theta"], row["vega"], row["put_rho"]),
+    )
+
+
+@perf.timed()
+def prune(max_rows: int | None = None) -> int:
+    """
+    Evict least recently used rows until at most max_rows remain.
+
+    Defaults to RETENTION_ROWS. Returns the number of rows deleted.
+    """
+    max_rows = RETENTION_ROWS if max_rows is None else max_rows
+    if max_rows is None:
+        return 0
+    with _transaction() as conn:
+        return _prune(conn, max_rows)
 
 
+def _prune(conn: sqlite3.Connection, max_rows: int) -> int:
+    excess = conn.execute("SELECT COUNT(*) FROM calculations").fetchone()[0] - max_rows
+    if excess <= 0:
+        return 0
+    return conn.execute(
+        "DELETE FROM calculations WHERE id IN (SELECT id FROM calculations ORDER BY last_used, id LIMIT ?)",
+        (excess,),
+    ).rowcount
+
+
+@perf.timed()
 def fetch_recent(limit: int = 10) -> list[dict]:
-    with get_connection() as conn:
-        conn.row_factory = sqlite3.Row
+    with _transaction() as conn:
         cursor = conn.execute(
             """
-            SELECT timestamp, spot_price, strike_price, time_to_expiry, 
+            SELECT timestamp, spot_price, strike_price, time_to_expiry,
                    risk_free_rate, volatility, call_price, put_price
             FROM calculations
             ORDER BY id DESC
@@ -71,4 +312,161 @@ def fetch_recent(limit: int = 10) -> list[dict]:
         return [dict(row) for row in cursor.fetchall()]
 
 
-init_db()
+# Parameter filters accepted by fetch_page/daily_summary, as (low, high) ranges
+FILTER_COLUMNS = {
+    "spot": "spot_price",
+    "strike": "strike_price",
+    "expiry": "time_to_expiry",
+    "rate": "risk_free_rate",
+    "vol": "volatility",
+}
+
+
+def _where(
+    start: str | None = None,
+    end: str | None = None,
+    before_id: int | None = None,
+    ranges: dict[str, tuple[float, float]] | None = None,
+    after_id: int | None = None,
+) -> tuple[str, list]:
+    clauses, params = [], []
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    if after_id is not None:
+        clauses.append("id > ?")
+        params.append(after_id)
+    if start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("timestamp < ?")
+        params.append(end)
+    for name, (low, high) in (ranges or {}).items():
+        column = FILTER_COLUMNS[name]
+        clauses.append(f"{column} BETWEEN ? AND ?")
+        params.extend((low, high))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+@perf.timed()
+def fetch_page(
+    before_id: int | None = None,
+    limit: int = 50,
+    start: str | None = None,
+    end: str | None = None,
+    ranges: dict[str, tuple[float, float]] | None = None,
+) -> list[dict]:
+    """
+    One page of history, newest first, using keyset pagination on id.
+
+    Rows are ordered by when their input set was first saved; timestamp is
+    the latest calculation, so a recalculated row keeps its place.
+
+    Pass the id of the last row of a page as before_id to get the next one;
+    unlike OFFSET this costs the same however deep the page is. start and
+    end bound the ISO timestamp (end exclusive) and ranges filters
+    parameters, e.g. ranges={"vol": (0.1, 0.3)}.
+    """
+    where, params = _where(start, end, before_id, ranges)
+    with _transaction() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT id, timestamp, spot_price, strike_price, time_to_expiry,
+                   risk_free_rate, volatility, call_price, put_price, hit_count
+            FROM calculations{where}
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (*params, limit),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
+# Columns history_chunks() can read
+HISTORY_COLUMNS = (
+    "id", "spot_price", "strike_price", "time_to_expiry", "risk_free_rate", "volatility",
+    "call_price", "put_price", *GREEK_COLUMNS,
+)
+
+
+def history_chunks(
+    columns: tuple[str, ...] = HISTORY_COLUMNS,
+    chunk_rows: int = 100_000,
+    start: str | None = None,
+    end: str | None = None,
+    ranges: dict[str, tuple[float, float]] | None = None,
+) -> Iterator[list[tuple]]:
+    """
+    The whole history, oldest first, as lists of at most chunk_rows rows.
+
+    Rows are plain tuples of the given columns (of HISTORY_COLUMNS), with
+    None for Greeks of rows saved without them. Each chunk is its own
+    keyset query on id, so the connection is held only while a chunk is
+    read and memory stays bounded however long the history is. Filters
+    are as for fetch_page().
+    """
+    unknown = set(columns) - set(HISTORY_COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown history columns: {sorted(unknown)}")
+    # The keyset needs each chunk's last id; select it only for that if not asked for
+    selected = columns if "id" in columns else ("id", *columns)
+    key = selected.index("id")
+    after_id = None
+    while True:
+        where, params = _where(start, end, ranges=ranges, after_id=after_id)
+        with _transaction() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # tuples convert straight to arrays
+            rows = cursor.execute(
+                f"SELECT {', '.join(selected)} FROM calculations{where} ORDER BY id LIMIT ?",
+                (*params, chunk_rows),
+            ).fetchall()
+        if rows:
+            yield rows if selected is columns else [row[1:] for row in rows]
+        if len(rows) < chunk_rows:
+            return
+        after_id = rows[-1][key]
+
+
+def history_version() -> tuple:
+    """
+    A value that changes whenever the history is written, by any connection.
+
+    Costs no table scan, so whole-history results can be cached on it.
+    """
+    with _transaction() as conn:
+        return (str(DB_PATH), id(conn), conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+
+
+@perf.timed()
+def daily_summary(
+    start: str | None = None,
+    end: str | None = None,
+    ranges: dict[str, tuple[float, float]] | None = None,
+    limit: int = 30,
+) -> list[dict]:
+    """Per-day counts, average volatility and price ranges, aggregated in SQL."""
+    where, params = _where(start, end, ranges=ranges)
+    with _transaction() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT substr(timestamp, 1, 10) AS day,
+                   COUNT(*) AS calculations,
+                   AVG(volatility) AS avg_volatility,
+                   MIN(call_price) AS min_call,
+                   MAX(call_price) AS max_call,
+                   MIN(put_price) AS min_put,
+                   MAX(put_price) AS max_put
+            FROM calculations{where}
+            GROUP BY day
+            ORDER BY day DESC
+            LIMIT ?
+            """,
+            (*params, limit),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    init_db()
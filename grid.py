@@ -0,0 +1,210 @@
+import numpy as np
+from dataclasses import dataclass, fields, replace
+
+from model import AmericanLattice, BlackScholesBatch, Greeks
+
+# Options priced per block when filling large grids, to bound working memory
+_BLOCK_ELEMENTS = 250_000
+_PUT_ONLY_GREEKS = ("delta", "theta", "rho")
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    spot_points: int = 25
+    vol_points: int = 25
+    spot_scale: tuple[float, float] = (0.7, 1.3)  # multiples of S
+    vol_scale: tuple[float, float] = (0.5, 1.5)  # multiples of sigma
+    min_vol: float = 0.05
+    american: bool = False
+    # Lattice steps per American cell; fewer than the headline price's 200 keeps grids interactive
+    lattice_steps: int = 200
+    # Place nodes by curvature of a coarse grid instead of evenly
+    adaptive: bool = False
+    # Storage precision of the price grids; pricing itself runs in float64
+    dtype: str = "float64"
+    # Also keep every Greek surface from the same price_all() pass
+    greeks: bool = False
+
+
+@dataclass
+class PriceGrid:
+    spot_range: np.ndarray
+    vol_range: np.ndarray
+    call_prices: np.ndarray  # rows are volatilities, columns are spot prices
+    put_prices: np.ndarray
+    # Greeks as a struct of 2D arrays, when priced with GridSpec(greeks=True)
+    call_greeks: Greeks | None = None
+    put_greeks: Greeks | None = None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.call_prices.shape
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.spot_range, self.vol_range, self.call_prices, self.put_prices]
+        for greeks in (self.call_greeks, self.put_greeks):
+            if greeks is not None:
+                arrays.extend(getattr(greeks, f.name) for f in fields(Greeks))
+        # Put and call share gamma and vega, so count each array once
+        return sum(array.nbytes for array in {id(a): a for a in arrays}.values())
+
+    def surface(self, option_type: str, metric: str = "price") -> np.ndarray:
+        """Price or one Greek (delta, gamma, theta, vega, rho) of "Call" or "Put"."""
+        if metric == "price":
+            return self.call_prices if option_type == "Call" else self.put_prices
+        greeks = self.call_greeks if option_type == "Call" else self.put_greeks
+        if greeks is None:
+            raise ValueError("grid was priced without Greeks; use GridSpec(greeks=True)")
+        return getattr(greeks, metric)
+
+    def downsample(self, max_points: int) -> "PriceGrid":
+        """
+        Keep at most max_points nodes per axis, evenly spaced in index space.
+
+        Charts cannot show more cells than they have pixels, so this trims
+        what gets serialized. Picking by index keeps an adaptive grid's
+        concentration of nodes where the surface bends.
+        """
+        rows = _even_indices(len(self.vol_range), max_points)
+        cols = _even_indices(len(self.spot_range), max_points)
+        index = np.ix_(rows, cols)
+        return PriceGrid(
+            spot_range=self.spot_range[cols],
+            vol_range=self.vol_range[rows],
+            call_prices=self.call_prices[index],
+            put_prices=self.put_prices[index],
+            call_greeks=_map_greeks(self.call_greeks, lambda a: a[index]),
+            put_greeks=_map_greeks(self.put_greeks, lambda a: a[index]),
+        )
+
+
+def _map_greeks(greeks: Greeks | None, fn) -> Greeks | None:
+    if greeks is None:
+        return None
+    return Greeks(**{f.name: fn(getattr(greeks, f.name)) for f in fields(Greeks)})
+
+
+def _even_indices(n: int, max_points: int) -> np.ndarray:
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+
+
+def _axis_bounds(S: float, sigma: float, spec: GridSpec) -> tuple[tuple[float, float], tuple[float, float]]:
+    return (
+        (S * spec.spot_scale[0], S * spec.spot_scale[1]),
+        (max(spec.min_vol, sigma * spec.vol_scale[0]), sigma * spec.vol_scale[1]),
+    )
+
+
+def _equidistribute(axis: np.ndarray, curvature: np.ndarray, n: int, floor: float = 0.25) -> np.ndarray:
+    """
+    Place n nodes over axis so each interval carries equal weight.
+
+    The weight is sqrt(|f''|), the density that equalises the error of
+    linear interpolation, plus a uniform floor so flat regions keep some
+    coverage.
+    """
+    weight = np.sqrt(curvature)
+    weight = weight + floor * weight.max() if weight.max() > 0 else np.ones_like(weight)
+    cumulative = np.concatenate([[0.0], np.cumsum(0.5 * (weight[1:] + weight[:-1]) * np.abs(np.diff(axis)))])
+    return np.interp(np.linspace(0.0, cumulative[-1], n), cumulative, axis)
+
+
+def _curvature_profile(values: np.ndarray, axis_values: np.ndarray, axis: int) -> np.ndarray:
+    """Max |second derivative| along one axis of a grid, per node of that axis."""
+    spacing = np.diff(axis_values)
+    centres = np.abs(0.5 * (spacing[1:] + spacing[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = np.diff(values, axis=axis) / (spacing if axis == 1 else spacing[:, np.newaxis])
+        second = np.abs(np.diff(first, axis=axis)) / (centres if axis == 1 else centres[:, np.newaxis])
+    profile = np.nan_to_num(second, nan=0.0, posinf=0.0).max(axis=1 - axis)
+    return np.concatenate([[profile[0]], profile, [profile[-1]]])
+
+
+def refine_axes(coarse: PriceGrid, spot_points: int, vol_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Spot and vol nodes concentrated where the coarse call/put surfaces bend most."""
+    spot_curvature = np.maximum(
+        _curvature_profile(coarse.call_prices, coarse.spot_range, axis=1),
+        _curvature_profile(coarse.put_prices, coarse.spot_range, axis=1),
+    )
+    vol_curvature = np.maximum(
+        _curvature_profile(coarse.call_prices, coarse.vol_range, axis=0),
+        _curvature_profile(coarse.put_prices, coarse.vol_range, axis=0),
+    )
+    return (
+        _equidistribute(coarse.spot_range, spot_curvature, spot_points),
+        _equidistribute(coarse.vol_range, vol_curvature, vol_points),
+    )
+
+
+def price_grid(
+    S: float,
+    K: float,
+    T: float,
+    r: float,
+    sigma: float,
+    spec: GridSpec = GridSpec(),
+    coarse: PriceGrid | None = None,
+) -> PriceGrid:
+    """
+    Call and put prices over a spot x vol grid.
+
+    With spec.adaptive, node placement follows the curvature of a coarse
+    25x25 grid over the same bounds (pass coarse to reuse one already
+    priced), which packs nodes near the strike and, at short expiries,
+    around the gamma spike. Large grids are priced in row blocks.
+
+    With spec.greeks, delta, gamma, theta, vega and rho surfaces come from
+    the same BlackScholesBatch.price_all() pass as the prices, which shares
+    d1, d2, the pdf and the CDFs across all of them. American grids take
+    lattice prices and Black-Scholes Greeks, as in the dashboard.
+    """
+    (spot_lo, spot_hi), (vol_lo, vol_hi) = _axis_bounds(S, sigma, spec)
+    if spec.adaptive:
+        if coarse is None:
+            coarse = price_grid(S, K, T, r, sigma, replace(spec, spot_points=25, vol_points=25, adaptive=False))
+        spot_range, vol_range = refine_axes(coarse, spec.spot_points, spec.vol_points)
+    else:
+        spot_range = np.linspace(spot_lo, spot_hi, spec.spot_points)
+        vol_range = np.linspace(vol_lo, vol_hi, spec.vol_points)
+
+    call_prices = np.empty((len(vol_range), len(spot_range)), dtype=spec.dtype)
+    put_prices = np.empty_like(call_prices)
+    call_greeks = put_greeks = None
+    if spec.greeks:
+        call_greeks = Greeks(*(np.empty_like(call_prices) for _ in fields(Greeks)))
+        # Gamma and vega are the same for calls and puts, so the arrays are shared
+        put_greeks = replace(
+            call_greeks,
+            **{name: np.empty_like(call_prices) for name in _PUT_ONLY_GREEKS},
+        )
+
+    rows_per_block = max(1, _BLOCK_ELEMENTS // len(spot_range))
+    for start in range(0, len(vol_range), rows_per_block):
+        block = slice(start, start + rows_per_block)
+        args = (spot_range[np.newaxis, :], K, T, r, vol_range[block, np.newaxis])
+        if spec.greeks:
+            values = BlackScholesBatch(*args).price_all()
+            call_prices[block], put_prices[block] = values.call_price, values.put_price
+            for f in fields(Greeks):
+                getattr(call_greeks, f.name)[block] = getattr(values.call_greeks, f.name)
+            for name in _PUT_ONLY_GREEKS:
+                getattr(put_greeks, name)[block] = getattr(values.put_greeks, name)
+            if spec.american:
+                lattice = AmericanLattice(*args, steps=spec.lattice_steps)
+                call_prices[block], put_prices[block] = lattice.call_price(), lattice.put_price()
+        else:
+            model = AmericanLattice(*args, steps=spec.lattice_steps) if spec.american else BlackScholesBatch(*args)
+            call_prices[block] = model.call_price()
+            put_prices[block] = model.put_price()
+
+    return PriceGrid(
+        spot_range=spot_range,
+        vol_range=vol_range,
+        call_prices=call_prices,
+        put_prices=put_prices,
+        call_greeks=call_greeks,
+        put_greeks=put_greeks,
+    )
@@ -0,0 +1,221 @@
+"""
+Delta-hedging backtests under discrete rebalancing.
+
+One option is sold at its Black-Scholes price and hedged with delta shares
+of the underlying, rebalanced every rebalance_every steps, with the cash
+account earning the risk-free rate. Whatever is left at expiry, discounted
+to today, is that path's hedging P&L. With paths at the hedging volatility
+it averages zero, and its spread shrinks like 1/sqrt(rebalances); a
+different realized volatility shows up as a gamma P&L bias.
+
+Paths are simulated as GBM or replayed from a spot history. Each step is
+one vectorized update across a chunk of paths, and only the current spot
+of each path is kept, so memory grows with chunk_paths, not with steps.
+"""
+import math
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+from model import BlackScholesBatch, norm_cdf
+
+# Paths hedged together; bounds the working set to a few arrays of this length
+CHUNK_PATHS = 20_000
+# Spot paths kept for plotting
+SAMPLE_PATHS = 20
+# Paths drawn from each random stream; chunks hold whole blocks, so the
+# simulated paths do not depend on chunk_paths
+STREAM_BLOCK = 1_000
+
+
+@dataclass
+class HedgeResult:
+    pnl: np.ndarray  # hedging P&L per path, per option sold, discounted to today
+    premium: float
+    rebalances: int
+    sample_paths: np.ndarray  # (paths, steps + 1) spots of the first few paths
+
+    def stats(self) -> dict[str, float]:
+        pnl = self.pnl
+        var_threshold = np.quantile(pnl, 0.05)
+        std = float(pnl.std(ddof=1)) if pnl.size > 1 else 0.0
+        return {
+            "mean": float(pnl.mean()),
+            "std": std,
+            "std_pct_premium": 100 * std / self.premium if self.premium > 0 else math.nan,
+            "var_95": float(-var_threshold),  # loss exceeded on 5% of paths
+            "es_95": float(-pnl[pnl <= var_threshold].mean()),  # average loss beyond it
+            "min": float(pnl.min()),
+            "max": float(pnl.max()),
+        }
+
+
+def _delta(S, K: float, T: float, r: float, sigma: float, is_call: bool) -> np.ndarray:
+    # N(d1) and N(d1) - 1, as in BlackScholesBatch.call_greeks/put_greeks, without
+    # the other Greeks; T > 0 at every rebalance, so the expiry branch is not needed
+    call_delta = norm_cdf(BlackScholesBatch(S, K, T, r, sigma).d1)
+    return call_delta if is_call else call_delta - 1.0
+
+
+def _hedge_chunk(
+    spots: Iterator[np.ndarray],
+    n: int,
+    S: float,
+    K: float,
+    T: float,
+    r: float,
+    sigma: float,
+    is_call: bool,
+    premium: float,
+    steps: int,
+    rebalance_every: int,
+    cost: float,
+    samples: np.ndarray,
+) -> np.ndarray:
+    """Hedge n paths whose spots arrive one step at a time; fills samples with the first rows."""
+    dt = T / steps
+    growth = math.exp(r * dt)
+    spot = np.full(n, float(S))
+    delta = np.full(n, _delta(S, K, T, r, sigma, is_call))
+    cash = premium - delta * spot - cost * np.abs(delta) * spot
+    keep = min(n, samples.shape[0])
+    samples[:keep, 0] = spot[:keep]
+
+    for step, spot in enumerate(spots, start=1):
+        samples[:keep, step] = spot[:keep]
+        cash *= growth
+        if step < steps and step % rebalance_every == 0:
+            new_delta = _delta(spot, K, T - step * dt, r, sigma, is_call)
+            trade = new_delta - delta
+            cash -= trade * spot + cost * np.abs(trade) * spot
+            delta = new_delta
+
+    payoff = np.maximum(spot - K, 0.0) if is_call else np.maximum(K - spot, 0.0)
+    # Unwind the hedge and settle the option at expiry
+    value = cash + delta * spot - cost * np.abs(delta) * spot - payoff
+    return value * math.exp(-r * T)
+
+
+def _gbm_spots(rngs: list[np.random.Generator], sizes: list[int], S: float, mu: float, vol: float, dt: float, steps: int) -> Iterator[np.ndarray]:
+    """Spots of one chunk, step by step; block i of sizes[i] paths draws from rngs[i]."""
+    n = sum(sizes)
+    spot = np.full(n, float(S))
+    shock = np.empty(n)
+    drift, diffusion = (mu - 0.5 * vol**2) * dt, vol * math.sqrt(dt)
+    for _ in range(steps):
+        start = 0
+        for rng, size in zip(rngs, sizes):
+            rng.standard_normal(out=shock[start : start + size])
+            start += size
+        shock *= diffusion
+        shock += drift
+        spot *= np.exp(shock, out=shock)
+        yield spot
+
+
+def _result(pnl: list[np.ndarray], premium: float, steps: int, rebalance_every: int, samples: np.ndarray, n: int) -> HedgeResult:
+    # Rebalances happen at every rebalance_every-th step before expiry, plus the initial hedge
+    rebalances = 1 + (steps - 1) // rebalance_every
+    return HedgeResult(np.concatenate(pnl), premium, rebalances, samples[: min(n, SAMPLE_PATHS)])
+
+
+def _premium(S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
+    bs = BlackScholesBatch(S, K, T, r, sigma)
+    return float(bs.call_price() if is_call else bs.put_price())
+
+
+def simulate_hedge(
+    S: float,
+    K: float,
+    T: float,
+    r: float,
+    sigma: float,
+    option_type: str = "Call",
+    paths: int = 10_000,
+    steps: int = 252,
+    rebalance_every: int = 1,
+    path_vol: float | None = None,
+    drift: float | None = None,
+    cost_bps: float = 0.0,
+    seed: int = 0,
+    chunk_paths: int = CHUNK_PATHS,
+) -> HedgeResult:
+    """
+    Hedge a sold option along GBM paths.
+
+    sigma prices and hedges the option; path_vol (default sigma) and drift
+    (default r) drive the simulated underlying. cost_bps is charged on
+    the notional of every share traded, including the unwind at expiry.
+    """
+    if T <= 0 or steps < 1 or rebalance_every < 1:
+        raise ValueError("need T > 0, steps >= 1 and rebalance_every >= 1")
+    is_call = option_type == "Call"
+    premium = _premium(S, K, T, r, sigma, is_call)
+    vol = sigma if path_vol is None else path_vol
+    mu = r if drift is None else drift
+    samples = np.empty((SAMPLE_PATHS, steps + 1))
+    blocks = math.ceil(paths / STREAM_BLOCK)
+    rngs = [np.random.default_rng(stream) for stream in np.random.SeedSequence(seed).spawn(blocks)]
+    sizes = [min(STREAM_BLOCK, paths - block * STREAM_BLOCK) for block in range(blocks)]
+    blocks_per_chunk = max(1, chunk_paths // STREAM_BLOCK)
+    pnl = []
+    for first in range(0, blocks, blocks_per_chunk):
+        chunk = slice(first, first + blocks_per_chunk)
+        n = sum(sizes[chunk])
+        spots = _gbm_spots(rngs[chunk], sizes[chunk], S, mu, vol, T / steps, steps)
+        chunk_samples = samples if first == 0 else np.empty((0, steps + 1))
+        pnl.append(_hedge_chunk(spots, n, S, K, T, r, sigma, is_call, premium, steps, rebalance_every, cost_bps / 1e4, chunk_samples))
+    return _result(pnl, premium, steps, rebalance_every, samples, paths)
+
+
+def replay_hedge(
+    spot_paths: np.ndarray,
+    K: float,
+    T: float,
+    r: float,
+    sigma: float,
+    option_type: str = "Call",
+    rebalance_every: int = 1,
+    cost_bps: float = 0.0,
+    chunk_paths: int = CHUNK_PATHS,
+) -> HedgeResult:
+    """
+    Hedge a sold option along given spot paths, one per row.
+
+    Every row must start at the same spot (see replay_paths), the spot at
+    which the option is sold; its columns are evenly spaced over T.
+    """
+    spot_paths = np.asarray(spot_paths, dtype=float)
+    n, steps = spot_paths.shape[0], spot_paths.shape[1] - 1
+    if n < 1 or steps < 1 or T <= 0 or rebalance_every < 1:
+        raise ValueError("need at least one path of two or more spots, T > 0 and rebalance_every >= 1")
+    S = float(spot_paths[0, 0])
+    if not np.allclose(spot_paths[:, 0], S):
+        raise ValueError("every path must start at the same spot")
+    is_call = option_type == "Call"
+    premium = _premium(S, K, T, r, sigma, is_call)
+    samples = np.empty((SAMPLE_PATHS, steps + 1))
+    pnl = []
+    for start in range(0, n, chunk_paths):
+        chunk = spot_paths[start : start + chunk_paths]
+        spots = (chunk[:, step] for step in range(1, steps + 1))
+        chunk_samples = samples if start == 0 else np.empty((0, steps + 1))
+        pnl.append(_hedge_chunk(spots, len(chunk), S, K, T, r, sigma, is_call, premium, steps, rebalance_every, cost_bps / 1e4, chunk_samples))
+    return _result(pnl, premium, steps, rebalance_every, samples, n)
+
+
+def replay_paths(history: np.ndarray, steps: int, S: float) -> np.ndarray:
+    """
+    Cut a spot history into non-overlapping windows of steps + 1 spots.
+
+    Each window is rescaled to start at S, so it replays the history's
+    returns from the option's starting spot.
+    """
+    history = np.asarray(history, dtype=float)
+    count = (history.size - 1) // steps
+    if count < 1:
+        raise ValueError(f"history of {history.size} spots is too short for {steps} steps")
+    starts = np.arange(count) * steps
+    windows = history[starts[:, np.newaxis] + np.arange(steps + 1)]
+    return windows * (S / windows[:, :1])
@@ -0,0 +1,131 @@
+import numpy as np
+from dataclasses import dataclass
+
+from model import BlackScholesBatch, norm_pdf
+
+
+@dataclass
+class ImpliedVolResult:
+    sigma: np.ndarray
+    iterations: np.ndarray
+    failed: np.ndarray
+
+
+def _model_price(S, K, T, r, sigma, is_call) -> tuple[np.ndarray, np.ndarray]:
+    """Return (price, vega) with vega per unit of sigma, not per 1%."""
+    model = BlackScholesBatch(S, K, T, r, sigma)
+    call = model.call_price()
+    # Put-call parity keeps this to a single pricing pass for mixed chains
+    price = np.where(is_call, call, call - S + K * np.exp(-r * T))
+    vega = S * norm_pdf(model.d1) * np.sqrt(T)
+    return price, vega
+
+
+def implied_volatility(
+    price,
+    S,
+    K,
+    T,
+    r,
+    option_type="Call",
+    tol: float = 1e-8,
+    sigma_tol: float = 1e-6,
+    max_iter: int = 50,
+    sigma_bounds: tuple[float, float] = (1e-6, 5.0),
+    max_bisect_iter: int = 200,
+) -> ImpliedVolResult:
+    """
+    Back out Black-Scholes volatility from market prices for a whole chain.
+
+    All inputs broadcast against each other; option_type is "Call"/"Put"
+    (or an array of them). Newton iterations run across the full array and
+    any element that leaves the sigma bounds, hits a vanishing vega, or does
+    not converge within max_iter is re-solved by bisection on sigma_bounds.
+
+    tol is relative: a quote is matched within tol * max(price, 1). An
+    element converges once it is matched and the matching error, divided
+    by vega, moves sigma by at most sigma_tol. Quotes outside or within
+    that tolerance of the no-arbitrage bounds, quotes whose vega is too
+    small for the price tolerance to pin sigma within sigma_tol, and
+    quotes with T <= 0 are reported as failed with sigma = NaN.
+    """
+    is_call = np.char.lower(np.asarray(option_type, dtype=str)) == "call"
+    price, S, K, T, r, is_call = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (price, S, K, T, r)), is_call
+    )
+    shape = price.shape
+    price, S, K, T, r, is_call = (x.ravel() for x in (price, S, K, T, r, is_call))
+    lo_sigma, hi_sigma = sigma_bounds
+    price_tol = tol * np.maximum(price, 1.0)
+
+    sigma = np.full(price.shape, np.nan)
+    iterations = np.zeros(price.shape, dtype=int)
+
+    # No-arbitrage bounds: a price outside them has no implied volatility
+    with np.errstate(invalid="ignore"):
+        discounted_K = K * np.exp(-r * T)
+        lower = np.where(is_call, np.maximum(S - discounted_K, 0.0), np.maximum(discounted_K - S, 0.0))
+        upper = np.where(is_call, S, discounted_K)
+        valid = (T > 0) & (S > 0) & (K > 0) & (price - lower > price_tol) & (upper - price > price_tol)
+
+    # Newton from the Manaster-Koehler point, where vega is maximal
+    idx = np.flatnonzero(valid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.sqrt(2 * np.abs(np.log(S[idx] / K[idx]) + r[idx] * T[idx]) / T[idx])
+    guess = np.clip(guess, 0.05, hi_sigma)
+    converged = np.zeros(price.shape, dtype=bool)
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        model_price, vega = _model_price(S[idx], K[idx], T[idx], r[idx], guess, is_call[idx])
+        iterations[idx] += 1
+        diff = model_price - price[idx]
+        done = (np.abs(diff) <= price_tol[idx]) & (np.abs(diff) <= vega * sigma_tol)
+        sigma[idx[done]] = guess[done]
+        converged[idx[done]] = True
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = guess - diff / vega
+        # Elements that would leave the bracket are handed to the fallback
+        ok = ~done & np.isfinite(step) & (step > lo_sigma) & (step < hi_sigma)
+        idx, guess = idx[ok], step[ok]
+
+    # Bracketed bisection for everything Newton did not settle
+    idx = np.flatnonzero(valid & ~converged)
+    price_lo, _ = _model_price(S[idx], K[idx], T[idx], r[idx], lo_sigma, is_call[idx])
+    price_hi, _ = _model_price(S[idx], K[idx], T[idx], r[idx], hi_sigma, is_call[idx])
+    bracketed = (price_lo <= price[idx]) & (price[idx] <= price_hi)
+    idx = idx[bracketed]
+    lo = np.full(idx.shape, lo_sigma)
+    hi = np.full(idx.shape, hi_sigma)
+    for _ in range(max_bisect_iter):
+        if idx.size == 0:
+            break
+        mid = 0.5 * (lo + hi)
+        model_price, vega = _model_price(S[idx], K[idx], T[idx], r[idx], mid, is_call[idx])
+        iterations[idx] += 1
+        diff = model_price - price[idx]
+        done = ((np.abs(diff) <= price_tol[idx]) & (np.abs(diff) <= vega * sigma_tol)) | (hi - lo < sigma_tol)
+        sigma[idx[done]] = mid[done]
+        converged[idx[done]] = True
+
+        too_high = diff > 0
+        hi = np.where(too_high, mid, hi)
+        lo = np.where(too_high, lo, mid)
+        keep = ~done
+        idx, lo, hi = idx[keep], lo[keep], hi[keep]
+
+    # Where vega is this small the price tolerance spans more than sigma_tol of
+    # volatility, so the quote does not determine sigma and any answer is arbitrary
+    idx = np.flatnonzero(converged)
+    _, vega = _model_price(S[idx], K[idx], T[idx], r[idx], sigma[idx], is_call[idx])
+    flat = idx[vega * sigma_tol < price_tol[idx]]
+    converged[flat] = False
+    sigma[flat] = np.nan
+
+    return ImpliedVolResult(
+        sigma=sigma.reshape(shape),
+        iterations=iterations.reshape(shape),
+        failed=~converged.reshape(shape),
+    )
@@ -0,0 +1,307 @@
+"""
+Tick replay and incremental repricing for following a moving underlying.
+
+Ticks come from a CSV file (columns time, spot and optionally vol; time in
+seconds) or from newline-delimited "time,spot[,vol]" text on a TCP socket.
+IncrementalPricer moves prices and Greeks along a Taylor expansion from its
+last full BlackScholes evaluation and only reprices when the estimated
+error of the expansion exceeds a tolerance.
+
+    python live.py generate ticks.csv --ticks 20000 --interval 0.01
+    python live.py serve ticks.csv --port 9100 --speed 5
+"""
+import argparse
+import csv
+import io
+import math
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+import numpy as np
+
+from model import BlackScholes
+
+# Headroom over the second- and third-order terms the estimate sums, for the
+# fourth-order ones it leaves out (see IncrementalPricer)
+ERROR_SAFETY = 2.0
+# The series stops converging once a move is comparable to the spot scale
+# of the density, S*sigma*sqrt(T), or to sigma itself; reprice beyond
+# these fractions of them
+MAX_MOVE_SCALE = 0.25
+MAX_VOL_MOVE = 0.1
+
+
+@dataclass
+class Tick:
+    time: float  # seconds
+    spot: float
+    vol: float | None = None
+
+
+@dataclass
+class Quote:
+    spot: float
+    sigma: float
+    call_price: float
+    put_price: float
+    call_delta: float
+    put_delta: float
+    gamma: float
+    vega: float
+    exact: bool  # True when this tick triggered a full reprice
+    error_estimate: float  # estimated |price error| of the expansion, in $
+
+
+@dataclass
+class PricerStats:
+    ticks: int = 0
+    full_reprices: int = 0
+    max_error_estimate: float = 0.0
+
+    @property
+    def avoided(self) -> int:
+        """Ticks served from the expansion instead of a full reprice."""
+        return self.ticks - self.full_reprices
+
+
+def _parse_tick(fields: list[str]) -> Tick:
+    vol = float(fields[2]) if len(fields) > 2 and fields[2].strip() else None
+    return Tick(float(fields[0]), float(fields[1]), vol)
+
+
+def read_ticks(source: str | Path | TextIO) -> Iterator[Tick]:
+    """Stream ticks from a CSV path or open text file with a time,spot[,vol] header."""
+    handle = open(source, newline="") if isinstance(source, (str, Path)) else source
+    try:
+        reader = csv.reader(handle)
+        header = [name.strip().lower() for name in next(reader)]
+        if header[:2] != ["time", "spot"]:
+            raise ValueError("tick file must start with a time,spot[,vol] header")
+        for fields in reader:
+            if fields:
+                yield _parse_tick(fields)
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def socket_ticks(host: str, port: int, timeout: float = 5.0) -> Iterator[Tick]:
+    """Stream ticks from newline-delimited time,spot[,vol] text until the peer closes."""
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        for line in io.TextIOWrapper(conn.makefile("rb"), encoding="ascii"):
+            line = line.strip()
+            if line and not line.startswith("time"):
+                yield _parse_tick(line.split(","))
+
+
+def paced(ticks: Iterable[Tick], speed: float = 1.0) -> Iterator[Tick]:
+    """
+    Yield ticks no faster than their timestamps allow, sped up by speed.
+
+    speed <= 0 replays as fast as the consumer can take them.
+    """
+    start = first = None
+    for tick in ticks:
+        if speed > 0:
+            if start is None:
+                start, first = time.perf_counter(), tick.time
+            delay = (tick.time - first) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        yield tick
+
+
+class Throttle:
+    """
+    Say when a UI frame is due, at most fps per second.
+
+    The interval runs from the end of the previous frame (frame_done()),
+    so a slow render lowers the frame rate instead of starving the tick
+    processing between frames.
+    """
+
+    def __init__(self, fps: float):
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.frames = 0
+        self._last = -math.inf
+
+    def ready(self) -> bool:
+        return time.perf_counter() - self._last >= self.interval
+
+    def frame_done(self) -> None:
+        self._last = time.perf_counter()
+        self.frames += 1
+
+
+class IncrementalPricer:
+    """
+    Follow spot (and optionally vol) moves from one full evaluation.
+
+    Prices move by delta*dS + gamma*dS^2/2 + vega*dsigma from the anchor.
+    The error estimate is ERROR_SAFETY times every omitted term up to third
+    order, each taken at its absolute value: vanna*dS*dsigma and
+    volga*dsigma^2/2, then speed*dS^3/6, zomma*dS^2*dsigma/2,
+    dvanna/dsigma*dS*dsigma^2/2 and ultima*dsigma^3/6. When it exceeds
+    max_error dollars, or a move exceeds MAX_MOVE_SCALE of S*sigma*sqrt(T)
+    or MAX_VOL_MOVE of sigma, the option is repriced in full and becomes
+    the new anchor. Within those moves the omitted fourth-order terms stay
+    well inside the ERROR_SAFETY headroom. Expired or zero-vol anchors are
+    always repriced, since their Greeks say nothing about a move across
+    the strike.
+    """
+
+    def __init__(self, K: float, T: float, r: float, sigma: float, max_error: float = 0.005):
+        self.K = K
+        self.T = T
+        self.r = r
+        self.sigma = sigma
+        self.max_error = max_error
+        self.stats = PricerStats()
+        self._anchor_spot: float | None = None
+
+    def _reprice(self, spot: float, sigma: float) -> Quote:
+        bs = BlackScholes(spot, self.K, self.T, self.r, sigma)
+        values = bs.price_all()
+        self._anchor_spot, self._anchor_sigma, self._values = spot, sigma, values
+        self._smooth = self.T > 0 and sigma > 0
+        if self._smooth:
+            d1, d2 = float(bs.d1), float(bs.d2)
+            gamma = values.call_greeks.gamma
+            vega = values.call_greeks.vega * 100  # per unit of vol
+            pdf_d1 = vega / (spot * math.sqrt(self.T))
+            # Magnitudes of the omitted derivatives, in spot and per unit of vol
+            self._vanna = abs(pdf_d1 * d2 / sigma)
+            self._volga = abs(vega * d1 * d2 / sigma)
+            self._speed = abs(gamma / spot * (1 + d1 / (sigma * math.sqrt(self.T))))
+            self._zomma = abs(gamma * (d1 * d2 - 1) / sigma)
+            self._vanna_vol = abs(pdf_d1 * (d1 * d2**2 - d1 - d2) / sigma**2)
+            self._ultima = abs(vega / sigma**2 * (d1 * d2 * (1 - d1 * d2) + d1**2 + d2**2))
+            self._max_move = MAX_MOVE_SCALE * spot * sigma * math.sqrt(self.T)
+            self._max_vol_move = MAX_VOL_MOVE * sigma
+        self.stats.full_reprices += 1
+        call, put = values.call_greeks, values.put_greeks
+        return Quote(
+            spot, sigma, values.call_price, values.put_price,
+            call.delta, put.delta, call.gamma, call.vega, exact=True, error_estimate=0.0,
+        )
+
+    def update(self, spot: float, sigma: float | None = None) -> Quote:
+        self.stats.ticks += 1
+        sigma = self.sigma if sigma is None else sigma
+        if self._anchor_spot is None or not self._smooth:
+            return self._reprice(spot, sigma)
+
+        dS, dsigma = abs(spot - self._anchor_spot), abs(sigma - self._anchor_sigma)
+        error = ERROR_SAFETY * (
+            self._vanna * dS * dsigma
+            + self._volga * dsigma**2 / 2
+            + self._speed * dS**3 / 6
+            + self._zomma * dS**2 * dsigma / 2
+            + self._vanna_vol * dS * dsigma**2 / 2
+            + self._ultima * dsigma**3 / 6
+        )
+        if error > self.max_error or dS > self._max_move or dsigma > self._max_vol_move:
+            return self._reprice(spot, sigma)
+        dS, dsigma = spot - self._anchor_spot, sigma - self._anchor_sigma
+
+        self.stats.max_error_estimate = max(self.stats.max_error_estimate, error)
+        values = self._values
+        call, put = values.call_greeks, values.put_greeks
+        # Vega is per 1% move, the same for calls and puts
+        shift = 0.5 * call.gamma * dS**2 + call.vega * dsigma * 100
+        return Quote(
+            spot,
+            sigma,
+            values.call_price + call.delta * dS + shift,
+            values.put_price + put.delta * dS + shift,
+            call.delta + call.gamma * dS,
+            put.delta + call.gamma * dS,
+            call.gamma,
+            call.vega,
+            exact=False,
+            error_estimate=error,
+        )
+
+
+def synthetic_ticks(
+    ticks: int = 20_000,
+    spot: float = 100.0,
+    vol: float = 0.2,
+    interval: float = 0.01,
+    seed: int = 0,
+    time_scale: float = 3600.0,
+) -> list[Tick]:
+    """
+    A GBM tick path, one tick every interval seconds, for demos and tests.
+
+    Each second of tick time covers time_scale seconds of trading, so a
+    replay of a few minutes moves the spot far enough to trigger reprices.
+    At time_scale=1 the path moves at its real-time pace.
+    """
+    rng = np.random.default_rng(seed)
+    # Seconds in a 252-day, 6.5-hour trading year
+    dt = interval * time_scale / (252 * 6.5 * 3600)
+    spots = spot * np.exp(np.cumsum(vol * math.sqrt(dt) * rng.standard_normal(ticks) - 0.5 * vol**2 * dt))
+    times = np.arange(ticks) * interval
+    return [Tick(t, s) for t, s in zip(np.round(times, 6).tolist(), np.round(spots, 4).tolist())]
+
+
+def generate_ticks(path: Path, *args, **kwargs) -> None:
+    """Write synthetic_ticks(*args, **kwargs) as a tick file."""
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["time", "spot"])
+        writer.writerows((tick.time, tick.spot) for tick in synthetic_ticks(*args, **kwargs))
+
+
+def serve_ticks(path: Path, port: int, speed: float = 1.0, host: str = "127.0.0.1") -> None:
+    """Replay a tick file to each client that connects, one client at a time."""
+    with socket.create_server((host, port)) as server:
+        print(f"Replaying {path} on {host}:{port} at {speed:g}x", file=sys.stderr)
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    for tick in paced(read_ticks(path), speed):
+                        vol = "" if tick.vol is None else f",{tick.vol}"
+                        conn.sendall(f"{tick.time},{tick.spot}{vol}\n".encode("ascii"))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_cmd = commands.add_parser("generate", help="write a synthetic tick file")
+    generate_cmd.add_argument("output", type=Path)
+    generate_cmd.add_argument("--ticks", type=int, default=20_000)
+    generate_cmd.add_argument("--spot", type=float, default=100.0)
+    generate_cmd.add_argument("--vol", type=float, default=0.2, help="annualized volatility of the path")
+    generate_cmd.add_argument("--interval", type=float, default=0.01, help="seconds between ticks")
+    generate_cmd.add_argument("--seed", type=int, default=0)
+    generate_cmd.add_argument("--time-scale", type=float, default=3600.0, help="trading seconds per second of tick time")
+
+    serve_cmd = commands.add_parser("serve", help="replay a tick file over TCP")
+    serve_cmd.add_argument("input", type=Path)
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=9100)
+    serve_cmd.add_argument("--speed", type=float, default=1.0, help="replay speed multiple (0 = unpaced)")
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        generate_ticks(args.output, args.ticks, args.spot, args.vol, args.interval, args.seed, args.time_scale)
+    else:
+        try:
+            serve_ticks(args.input, args.port, args.speed, args.host)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Monte Carlo pricing under geometric Brownian motion.
+
+Paths are simulated in memory-bounded chunks. Each chunk draws from its own
+child of one SeedSequence, so a seeded run gives the same answer whether the
+chunks are evaluated in-process or spread over a process pool.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from model import BlackScholes
+
+# Payoffs map an (n_paths, n_steps) array of prices at t_1..t_N to payoffs
+Payoff = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass(frozen=True)
+class EuropeanCall:
+    K: float
+
+    def __call__(self, paths: np.ndarray) -> np.ndarray:
+        return np.maximum(paths[:, -1] - self.K, 0.0)
+
+
+@dataclass(frozen=True)
+class EuropeanPut:
+    K: float
+
+    def __call__(self, paths: np.ndarray) -> np.ndarray:
+        return np.maximum(self.K - paths[:, -1], 0.0)
+
+
+@dataclass(frozen=True)
+class AsianCall:
+    """Arithmetic-average call, averaged over the simulation dates."""
+
+    K: float
+
+    def __call__(self, paths: np.ndarray) -> np.ndarray:
+        return np.maximum(paths.mean(axis=1) - self.K, 0.0)
+
+
+@dataclass
+class MonteCarloResult:
+    price: float
+    std_error: float
+    paths: int
+    control_beta: float | None = None
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    S: float
+    T: float
+    r: float
+    sigma: float
+    steps: int
+    paths: int
+    antithetic: bool
+    payoff: Payoff
+    control_strike: float | None
+    seed: np.random.SeedSequence
+
+
+def _simulate_chunk(chunk: _Chunk) -> np.ndarray:
+    """Return sufficient statistics [n, sum y, sum y^2, sum x, sum x^2, sum xy]."""
+    rng = np.random.default_rng(chunk.seed)
+    dt = chunk.T / chunk.steps
+    half = (chunk.paths + 1) // 2 if chunk.antithetic else chunk.paths
+
+    z = rng.standard_normal((half, chunk.steps))
+    if chunk.antithetic:
+        z = np.concatenate([z, -z])
+    increments = (chunk.r - 0.5 * chunk.sigma**2) * dt + chunk.sigma * math.sqrt(dt) * z
+    paths = chunk.S * np.exp(np.cumsum(increments, axis=1, out=increments))
+
+    discount = math.exp(-chunk.r * chunk.T)
+    y = discount * chunk.payoff(paths)
+    x = (
+        discount * np.maximum(paths[:, -1] - chunk.control_strike, 0.0)
+        if chunk.control_strike is not None
+        else np.zeros_like(y)
+    )
+    if chunk.antithetic:
+        # An antithetic pair is one independent sample
+        y = 0.5 * (y[:half] + y[half:])
+        x = 0.5 * (x[:half] + x[half:])
+
+    return np.array([y.size, y.sum(), y @ y, x.sum(), x @ x, x @ y])
+
+
+class MonteCarloEngine:
+    """
+    Vectorized GBM Monte Carlo with optional variance reduction.
+
+    antithetic pairs each normal draw with its negation. control_variate uses
+    the discounted European call payoff, whose exact value is
+    BlackScholes.call_price(), as a control with a regression-estimated
+    coefficient; its strike defaults to the payoff's K (or S). workers=None
+    uses every core, 0 or 1 runs in-process.
+    """
+
+    def __init__(
+        self,
+        S: float,
+        T: float,
+        r: float,
+        sigma: float,
+        steps: int = 1,
+        paths: int = 1_000_000,
+        chunk_size: int | None = None,
+        antithetic: bool = True,
+        control_variate: bool = True,
+        seed: int | None = None,
+        workers: int | None = 0,
+    ):
+        self.S = S
+        self.T = T
+        self.r = r
+        self.sigma = sigma
+        self.steps = steps
+        self.paths = paths
+        # Bound each chunk's path array to ~2M floats (16 MB)
+        self.chunk_size = chunk_size or max(1_000, 2_000_000 // steps)
+        self.antithetic = antithetic
+        self.control_variate = control_variate
+        self.seed = seed
+        self.workers = os.cpu_count() if workers is None else workers
+
+    def _chunks(self, payoff: Payoff, control_strike: float | None) -> list[_Chunk]:
+        sizes = [self.chunk_size] * (self.paths // self.chunk_size)
+        if self.paths % self.chunk_size:
+            sizes.append(self.paths % self.chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        return [
+            _Chunk(self.S, self.T, self.r, self.sigma, self.steps, n, self.antithetic, payoff, control_strike, seed)
+            for n, seed in zip(sizes, seeds)
+        ]
+
+    def price(self, payoff: Payoff) -> MonteCarloResult:
+        control_strike = getattr(payoff, "K", self.S) if self.control_variate else None
+        chunks = self._chunks(payoff, control_strike)
+
+        if self.workers and self.workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+                stats = sum(pool.map(_simulate_chunk, chunks))
+        else:
+            stats = sum(_simulate_chunk(chunk) for chunk in chunks)
+
+        n, sum_y, sum_yy, sum_x, sum_xx, sum_xy = stats
+        mean_y = sum_y / n
+        var_y = (sum_yy - n * mean_y**2) / (n - 1)
+        if control_strike is None:
+            return MonteCarloResult(price=float(mean_y), std_error=math.sqrt(max(var_y, 0.0) / n), paths=self.paths)
+
+        mean_x = sum_x / n
+        var_x = (sum_xx - n * mean_x**2) / (n - 1)
+        cov_xy = (sum_xy - n * mean_x * mean_y) / (n - 1)
+        beta = cov_xy / var_x if var_x > 0 else 0.0
+        exact_x = float(BlackScholes(self.S, control_strike, self.T, self.r, self.sigma).call_price())
+        var_adjusted = max(var_y - beta * cov_xy, 0.0)
+        return MonteCarloResult(
+            price=float(mean_y - beta * (mean_x - exact_x)),
+            std_error=math.sqrt(var_adjusted / n),
+            paths=self.paths,
+            control_beta=float(beta),
+        )
@@ -0,0 +1,94 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from portfolio import Portfolio
+from styles import inject_custom_css
+
+st.set_page_config(
+    page_title="Portfolio Risk",
+    page_icon="📈",
+    layout="wide",
+)
+
+inject_custom_css()
+
+st.title("Portfolio Risk")
+
+with st.sidebar:
+    st.markdown("### Book")
+    n_positions = st.number_input(
+        "Positions",
+        min_value=100,
+        max_value=500_000,
+        value=50_000,
+        step=1_000,
+        help="Size of the synthetic book",
+    )
+    n_underlyings = st.number_input("Underlyings", min_value=1, max_value=100, value=10, step=1)
+    seed = st.number_input("Seed", min_value=0, value=0, step=1)
+
+# The book lives in the session so spot moves can re-risk it incrementally
+book_key = (int(n_positions), int(n_underlyings), int(seed))
+if st.session_state.get("portfolio_key") != book_key:
+    start = time.perf_counter()
+    st.session_state.portfolio = Portfolio.random(*book_key)
+    st.session_state.portfolio_key = book_key
+    st.session_state.portfolio_timing = ("Full book priced", len(st.session_state.portfolio), time.perf_counter() - start)
+book: Portfolio = st.session_state.portfolio
+
+with st.sidebar:
+    st.markdown("---")
+    st.markdown("### Spot Move")
+    underlying = st.selectbox("Underlying", options=book.underlyings)
+    code = book.underlyings.index(underlying)
+    new_spot = st.number_input(
+        "Spot Price ($)",
+        min_value=0.01,
+        value=float(book.spots[code]),
+        step=1.0,
+        format="%.2f",
+        # Keyed by book too, so a regenerated book starts from its own spots
+        key=f"spot_{'_'.join(map(str, book_key))}_{underlying}",
+    )
+
+if new_spot != book.spots[code]:
+    start = time.perf_counter()
+    repriced = book.set_spot(underlying, new_spot)
+    st.session_state.portfolio_timing = (f"Re-risked {underlying}", repriced, time.perf_counter() - start)
+
+label, repriced, elapsed = st.session_state.portfolio_timing
+st.caption(f"{label}: {repriced:,} of {len(book):,} positions in {elapsed * 1000:.1f} ms")
+
+summary = book.aggregate()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Book Value", f"${summary.value.sum():,.0f}")
+col2.metric("Net Vega", f"{summary.vega.sum():,.1f}")
+col3.metric("Net Theta", f"{summary.theta.sum():,.1f}")
+col4.metric("Positions", f"{len(book):,}")
+
+st.markdown("## Risk by Underlying")
+df = pd.DataFrame({
+    "Underlying": summary.underlyings,
+    "Positions": summary.positions,
+    "Spot": summary.spots,
+    "Value": summary.value,
+    "Delta": summary.delta,
+    "Gamma": summary.gamma,
+    "Vega": summary.vega,
+    "Theta": summary.theta,
+})
+st.dataframe(
+    df,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "Spot": st.column_config.NumberColumn(format="$%.2f"),
+        "Value": st.column_config.NumberColumn(format="$%.0f"),
+        "Delta": st.column_config.NumberColumn(format="%.1f"),
+        "Gamma": st.column_config.NumberColumn(format="%.3f"),
+        "Vega": st.column_config.NumberColumn(format="%.1f"),
+        "Theta": st.column_config.NumberColumn(format="%.1f"),
+    },
+)
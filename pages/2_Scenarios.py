@@ -0,0 +1,112 @@
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from scenarios import DIMS, METRICS, LabeledArray, cube_nbytes, scenario_cube
+from styles import inject_custom_css
+
+st.set_page_config(
+    page_title="Stress Scenarios",
+    page_icon="📈",
+    layout="wide",
+)
+
+inject_custom_css()
+
+st.title("Stress Scenarios")
+
+DIM_LABELS = {"spot": "Spot Price ($)", "vol": "Volatility (%)", "rate": "Risk-Free Rate (%)", "days": "Days Forward"}
+DIM_SCALE = {"spot": 1, "vol": 100, "rate": 100, "days": 1}
+POINTS = [11, 21, 41, 61, 81]
+
+with st.sidebar:
+    st.markdown("### Base Parameters")
+    S = st.number_input("Spot Price ($)", min_value=0.01, value=100.0, step=1.0)
+    K = st.number_input("Strike Price ($)", min_value=0.01, value=100.0, step=1.0)
+    T = st.number_input("Time to Expiry (Years)", min_value=0.01, value=0.5, step=0.01)
+    sigma = st.number_input("Volatility (%)", min_value=0.5, value=20.0, step=0.5) / 100
+    r = st.number_input("Risk-Free Rate (%)", min_value=0.0, value=5.0, step=0.1) / 100
+
+    st.markdown("---")
+    st.markdown("### Scenario Grid")
+    spot_shock = st.slider("Spot Shock (±%)", 5, 80, 30)
+    vol_shock = st.slider("Vol Shock (± pts)", 1, 50, 15)
+    rate_shock = st.slider("Rate Shock (± bp)", 0, 500, 200, step=25)
+    max_days = st.slider("Days Forward", 0, 365, 60)
+    points = st.select_slider("Points per Axis", options=POINTS, value=41)
+    budget_mb = st.number_input("Memory Budget (MB)", min_value=8, max_value=4096, value=256, step=8)
+
+
+
+
+def axis_sizes(points: int, max_days: int) -> tuple[int, int, int, int]:
+    return points, points, min(points, 21), min(points, max_days + 1)
+
+
+@st.cache_resource(max_entries=4)
+def build_cube(S: float, K: float, T: float, sigma: float, r: float, spot_shock: int, vol_shock: int,
+               rate_shock: int, max_days: int, points: int, budget_mb: int, metric: str) -> tuple[LabeledArray, float]:
+    # Only the metric on show, in float32: the cache is shared by every session
+    n_spot, n_vol, n_rate, n_days = axis_sizes(points, max_days)
+    start = time.perf_counter()
+    cube = scenario_cube(
+        K,
+        T,
+        spots=np.linspace(S * (1 - spot_shock / 100), S * (1 + spot_shock / 100), n_spot),
+        vols=np.linspace(max(0.01, sigma - vol_shock / 100), sigma + vol_shock / 100, n_vol),
+        rates=np.linspace(max(0.0, r - rate_shock / 10_000), r + rate_shock / 10_000, n_rate),
+        days=np.linspace(0, max_days, n_days).round(),
+        metrics=(metric,),
+        memory_budget=budget_mb * 2**20,
+    )
+    return cube, time.perf_counter() - start
+
+
+col_metric, col_x, col_y = st.columns(3)
+metric = col_metric.selectbox("Metric", options=list(METRICS))
+x_dim = col_x.selectbox("X Axis", options=DIMS, index=0, format_func=DIM_LABELS.get)
+y_dim = col_y.selectbox("Y Axis", options=[d for d in DIMS if d != x_dim], format_func=DIM_LABELS.get)
+
+# Cap the points so the cube takes at most half the budget, leaving the rest for the working set
+fitting = [p for p in POINTS if p <= points and cube_nbytes(axis_sizes(p, max_days)) <= budget_mb * 2**20 // 2]
+used_points = fitting[-1] if fitting else POINTS[0]
+cube, elapsed = build_cube(S, K, T, sigma, r, spot_shock, vol_shock, rate_shock, max_days, used_points, budget_mb, metric)
+scenarios = int(np.prod(cube.values.shape[1:]))
+capped = f" · capped at {used_points} points per axis to fit the memory budget" if used_points < points else ""
+st.caption(f"{scenarios:,} scenarios · {cube.nbytes / 2**20:,.1f} MB · computed in {elapsed:.2f}s{capped}")
+
+# Every other dimension is pinned to a coordinate; slicing is a view, no repricing
+fixed = {"metric": metric}
+pinned = [d for d in DIMS if d not in (x_dim, y_dim)]
+for col, dim in zip(st.columns(len(pinned)), pinned):
+    coord = cube.coords[dim]
+    fixed[dim] = col.select_slider(
+        DIM_LABELS[dim],
+        options=list(coord),
+        value=coord[len(coord) // 2],
+        format_func=lambda v, dim=dim: f"{v * DIM_SCALE[dim]:,.2f}",
+    )
+
+plane = cube.plane(y_dim, x_dim, **fixed)
+fig = go.Figure(
+    data=go.Heatmap(
+        z=plane.values,
+        x=np.round(plane.coords[x_dim] * DIM_SCALE[x_dim], 2),
+        y=np.round(plane.coords[y_dim] * DIM_SCALE[y_dim], 2),
+        colorscale="Viridis",
+        colorbar=dict(title=metric),
+    )
+)
+fig.update_layout(
+    title=f"{metric} by {DIM_LABELS[y_dim]} and {DIM_LABELS[x_dim]}",
+    xaxis_title=DIM_LABELS[x_dim],
+    yaxis_title=DIM_LABELS[y_dim],
+    height=550,
+    font=dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13),
+    margin=dict(l=0, r=0, t=40, b=0),
+    plot_bgcolor="rgba(255, 255, 255, 0.9)",
+    paper_bgcolor="rgba(245, 245, 247, 0)",
+)
+st.plotly_chart(fig, use_container_width=True)
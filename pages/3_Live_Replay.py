@@ -0,0 +1,131 @@
+import io
+from collections import deque
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from live import IncrementalPricer, Throttle, paced, read_ticks, socket_ticks, synthetic_ticks
+from styles import inject_custom_css
+
+st.set_page_config(
+    page_title="Live Replay",
+    page_icon="📈",
+    layout="wide",
+)
+
+inject_custom_css()
+
+st.title("Live Replay")
+
+# Ticks kept for the charts
+HISTORY_POINTS = 2_000
+SPEEDS = [0, 1, 2, 5, 10, 50, 100]
+
+with st.sidebar:
+    st.markdown("### Tick Source")
+    source = st.radio("Source", options=["Synthetic", "Tick File", "Socket"], label_visibility="collapsed")
+    if source == "Synthetic":
+        n_ticks = st.number_input("Ticks", min_value=100, max_value=1_000_000, value=20_000, step=1_000)
+        interval = st.number_input("Seconds Between Ticks", min_value=0.001, value=0.05, step=0.01, format="%.3f")
+        path_vol = st.number_input("Path Volatility (%)", min_value=1.0, value=20.0, step=1.0) / 100
+    elif source == "Tick File":
+        upload = st.file_uploader("Tick CSV", type="csv", help="Columns time, spot and optionally vol; time in seconds")
+    else:
+        host = st.text_input("Host", value="127.0.0.1")
+        port = st.number_input("Port", min_value=1, max_value=65_535, value=9100, help="e.g. from python live.py serve ticks.csv")
+
+    st.markdown("---")
+    st.markdown("### Option")
+    K = st.number_input("Strike Price ($)", min_value=0.01, value=100.0, step=1.0)
+    T = st.number_input("Time to Expiry (Years)", min_value=0.0, value=0.1, step=0.01)
+    r = st.number_input("Risk-Free Rate (%)", min_value=0.0, value=5.0, step=0.1) / 100
+    sigma = st.number_input("Volatility (%)", min_value=0.0, value=20.0, step=0.5, help="Used when ticks carry no vol") / 100
+
+    st.markdown("---")
+    st.markdown("### Replay")
+    max_error = st.number_input(
+        "Max Error ($)",
+        min_value=0.0001,
+        value=0.005,
+        step=0.001,
+        format="%.4f",
+        help="Reprice in full once the estimated error of the Taylor update exceeds this",
+    )
+    fps = st.slider("Target Frame Rate (fps)", min_value=1, max_value=30, value=10)
+    speed = st.select_slider("Replay Speed", options=SPEEDS, value=10, format_func=lambda x: "Max" if x == 0 else f"{x}x")
+    start = st.button("Start Replay", type="primary", use_container_width=True)
+
+metric_cols = st.columns(5)
+metrics = [col.empty() for col in metric_cols]
+status = st.empty()
+chart_spot, chart_prices = st.columns(2, gap="large")
+spot_chart, price_chart = chart_spot.empty(), chart_prices.empty()
+
+
+def line_figure(title: str, times, series: dict) -> go.Figure:
+    fig = go.Figure([go.Scatter(x=times, y=values, name=name, mode="lines") for name, values in series.items()])
+    fig.update_layout(
+        title=title,
+        xaxis_title="Time (s)",
+        height=320,
+        font=dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13),
+        margin=dict(l=0, r=0, t=40, b=0),
+        plot_bgcolor="rgba(255, 255, 255, 0.9)",
+        paper_bgcolor="rgba(245, 245, 247, 0)",
+    )
+    return fig
+
+
+def render(quote, pricer: IncrementalPricer, throttle: Throttle, history: deque) -> None:
+    metrics[0].metric("Spot", f"${quote.spot:,.2f}")
+    metrics[1].metric("Call", f"${quote.call_price:,.4f}")
+    metrics[2].metric("Put", f"${quote.put_price:,.4f}")
+    metrics[3].metric("Call Delta", f"{quote.call_delta:.4f}")
+    metrics[4].metric("Gamma", f"{quote.gamma:.4f}")
+
+    stats = pricer.stats
+    avoided_pct = 100 * stats.avoided / stats.ticks
+    status.caption(
+        f"{stats.ticks:,} ticks · {stats.full_reprices:,} full reprices · "
+        f"{stats.avoided:,} avoided ({avoided_pct:.1f}%) · max est. error ${stats.max_error_estimate:.4f} · "
+        f"{throttle.frames + 1:,} frames"  # counting this one
+    )
+
+    times, spots, calls, puts = zip(*history)
+    spot_chart.plotly_chart(line_figure("Spot", times, {"Spot": spots}), use_container_width=True)
+    price_chart.plotly_chart(line_figure("Option Prices", times, {"Call": calls, "Put": puts}), use_container_width=True)
+    throttle.frame_done()
+
+
+if start:
+    if source == "Synthetic":
+        ticks = synthetic_ticks(int(n_ticks), 100.0, path_vol, interval)
+    elif source == "Tick File":
+        if upload is None:
+            st.warning("Upload a tick CSV first.")
+            st.stop()
+        ticks = read_ticks(io.TextIOWrapper(upload, encoding="utf-8"))
+    else:
+        ticks = socket_ticks(host, int(port))
+
+    pricer = IncrementalPricer(K, T, r, sigma, max_error)
+    throttle = Throttle(fps)
+    history: deque = deque(maxlen=HISTORY_POINTS)
+    quote = None
+    try:
+        for tick in paced(ticks, speed):
+            quote = pricer.update(tick.spot, tick.vol)
+            history.append((tick.time, quote.spot, quote.call_price, quote.put_price))
+            if throttle.ready():
+                render(quote, pricer, throttle, history)
+    except (OSError, ValueError) as exc:
+        st.error(f"Replay stopped: {exc}")
+
+    if quote is not None:
+        render(quote, pricer, throttle, history)
+        st.success(
+            f"Replay finished: {pricer.stats.avoided:,} of {pricer.stats.ticks:,} ticks "
+            "were updated by Taylor expansion instead of a full reprice."
+        )
+else:
+    st.info("Pick a tick source and press Start Replay. Prices follow the spot through delta, gamma and vega, repricing in full only when the estimated error exceeds the limit.")
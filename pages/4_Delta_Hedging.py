@@ -0,0 +1,135 @@
+import io
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from hedging import HedgeResult, replay_hedge, replay_paths, simulate_hedge
+from live import read_ticks
+from styles import inject_custom_css
+
+st.set_page_config(
+    page_title="Delta Hedging",
+    page_icon="📈",
+    layout="wide",
+)
+
+inject_custom_css()
+
+st.title("Delta Hedging Backtest")
+
+# Rebalance interval in steps -> label
+REBALANCE = {1: "Every Step", 2: "Every 2 Steps", 5: "Every 5 Steps", 21: "Every 21 Steps", 63: "Every 63 Steps"}
+FONT = dict(family="-apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif", size=13)
+
+with st.sidebar:
+    st.markdown("### Option Sold")
+    option_type = st.radio("Option Type", options=["Call", "Put"], horizontal=True)
+    S = st.number_input("Spot Price ($)", min_value=0.01, value=100.0, step=1.0)
+    K = st.number_input("Strike Price ($)", min_value=0.01, value=100.0, step=1.0)
+    T = st.number_input("Time to Expiry (Years)", min_value=0.01, value=1.0, step=0.01)
+    sigma = st.number_input("Hedging Volatility (%)", min_value=0.5, value=20.0, step=0.5, help="Prices the option and sets the hedge ratios") / 100
+    r = st.number_input("Risk-Free Rate (%)", min_value=0.0, value=5.0, step=0.1) / 100
+
+    st.markdown("---")
+    st.markdown("### Paths")
+    source = st.radio("Path Source", options=["Simulated (GBM)", "Tick File"], label_visibility="collapsed")
+    steps = st.number_input("Steps to Expiry", min_value=1, max_value=5_000, value=252, step=1)
+    if source == "Simulated (GBM)":
+        paths = st.number_input("Paths", min_value=100, max_value=200_000, value=10_000, step=1_000)
+        path_vol = st.number_input("Realized Volatility (%)", min_value=0.5, value=20.0, step=0.5) / 100
+        drift = st.number_input("Drift (%)", value=5.0, step=0.5) / 100
+        seed = st.number_input("Seed", min_value=0, value=0, step=1)
+    else:
+        upload = st.file_uploader("Tick CSV", type="csv", help="Columns time and spot; cut into windows of Steps + 1 ticks")
+
+    st.markdown("---")
+    st.markdown("### Hedging")
+    rebalance_every = st.select_slider("Rebalance", options=list(REBALANCE), format_func=REBALANCE.get)
+    cost_bps = st.number_input("Transaction Cost (bp)", min_value=0.0, value=0.0, step=1.0, help="Charged on the notional of every share traded")
+
+
+@st.cache_resource(max_entries=4)
+def run_simulated(S: float, K: float, T: float, r: float, sigma: float, option_type: str, paths: int, steps: int,
+                  rebalance_every: int, path_vol: float, drift: float, cost_bps: float, seed: int) -> tuple[HedgeResult, float]:
+    start = time.perf_counter()
+    result = simulate_hedge(S, K, T, r, sigma, option_type, paths, steps, rebalance_every, path_vol, drift, cost_bps, seed)
+    return result, time.perf_counter() - start
+
+
+@st.cache_resource(max_entries=4)
+def run_replay(data: bytes, S: float, K: float, T: float, r: float, sigma: float, option_type: str, steps: int,
+               rebalance_every: int, cost_bps: float) -> tuple[HedgeResult, float]:
+    history = np.fromiter((tick.spot for tick in read_ticks(io.StringIO(data.decode()))), dtype=float)
+    start = time.perf_counter()
+    result = replay_hedge(replay_paths(history, steps, S), K, T, r, sigma, option_type, rebalance_every, cost_bps)
+    return result, time.perf_counter() - start
+
+
+if source == "Simulated (GBM)":
+    result, elapsed = run_simulated(S, K, T, r, sigma, option_type, paths, steps, rebalance_every, path_vol, drift, cost_bps, seed)
+else:
+    if upload is None:
+        st.info("Upload a tick file to replay its spot path, e.g. from python live.py generate ticks.csv")
+        st.stop()
+    try:
+        result, elapsed = run_replay(upload.getvalue(), S, K, T, r, sigma, option_type, steps, rebalance_every, cost_bps)
+    except ValueError as e:
+        st.error(f"Could not replay tick file: {e}")
+        st.stop()
+
+stats = result.stats()
+st.caption(
+    f"{result.pnl.size:,} paths × {steps:,} steps · {result.rebalances} rebalances per path · "
+    f"premium ${result.premium:,.2f} · simulated in {elapsed:.2f}s"
+)
+
+metric_cols = st.columns(5)
+metric_cols[0].metric("Mean P&L", f"${stats['mean']:,.3f}")
+metric_cols[1].metric("Std Dev", f"${stats['std']:,.3f}", help=f"{stats['std_pct_premium']:.1f}% of the premium")
+metric_cols[2].metric("95% VaR", f"${stats['var_95']:,.3f}", help="Loss exceeded on 5% of paths")
+metric_cols[3].metric("95% ES", f"${stats['es_95']:,.3f}", help="Average loss on the worst 5% of paths")
+metric_cols[4].metric("Worst Path", f"${stats['min']:,.3f}")
+
+col_hist, col_paths = st.columns(2, gap="large")
+
+with col_hist:
+    fig = go.Figure(go.Histogram(x=result.pnl, nbinsx=80, marker_color="#0071e3"))
+    fig.add_vline(x=stats["mean"], line_dash="dash", annotation_text="Mean")
+    fig.update_layout(
+        title="Hedging P&L per Option Sold",
+        xaxis_title="P&L at Expiry, Discounted ($)",
+        yaxis_title="Paths",
+        height=400,
+        bargap=0.05,
+        font=FONT,
+        margin=dict(l=0, r=0, t=40, b=0),
+        plot_bgcolor="rgba(255, 255, 255, 0.9)",
+        paper_bgcolor="rgba(245, 245, 247, 0)",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+with col_paths:
+    times = np.linspace(0, T, result.sample_paths.shape[1])
+    fig = go.Figure(
+        [go.Scatter(x=times, y=path, mode="lines", line=dict(width=1), showlegend=False) for path in result.sample_paths]
+    )
+    fig.add_hline(y=K, line_dash="dash", annotation_text="Strike")
+    fig.update_layout(
+        title=f"Sample Spot Paths ({len(result.sample_paths)})",
+        xaxis_title="Time (Years)",
+        yaxis_title="Spot Price ($)",
+        height=400,
+        font=FONT,
+        margin=dict(l=0, r=0, t=40, b=0),
+        plot_bgcolor="rgba(255, 255, 255, 0.9)",
+        paper_bgcolor="rgba(245, 245, 247, 0)",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+st.caption(
+    "P&L of selling the option at its Black-Scholes price and delta hedging it to expiry. "
+    "With realized volatility equal to the hedging volatility it averages zero and its spread "
+    "falls like 1/√rebalances; realized volatility above it costs the seller money."
+)
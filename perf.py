@@ -0,0 +1,131 @@
+"""
+Per-rerun timings and counters for the dashboard's hot paths.
+
+A run is recorded per thread (Streamlit runs each session's script in its
+own thread) between start_run() and end_run(). Outside a run, stage() hands
+back a shared no-op context manager and timed()/count() return after one
+thread-local lookup, so the instrumentation can stay in place permanently.
+"""
+import cProfile
+import functools
+import io
+import json
+import marshal
+import pstats
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+
+class _Local(threading.local):
+    # Class defaults make a missing run a plain attribute read, not an AttributeError
+    run: "Run | None" = None
+    clock: float = 0.0
+
+
+_local = _Local()
+_NOOP = nullcontext()
+
+
+@dataclass
+class Run:
+    label: str
+    started: float  # Unix time
+    total: float = 0.0  # wall seconds from start_run() to end_run()
+    timings: dict[str, float] = field(default_factory=dict)  # seconds per stage, summed over calls
+    calls: dict[str, int] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+
+class _Stage:
+    __slots__ = ("run", "name", "start")
+
+    def __init__(self, run: Run, name: str):
+        self.run = run
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.run.add(self.name, time.perf_counter() - self.start)
+
+
+def start_run(label: str = "", enabled: bool = True) -> None:
+    """Begin recording on this thread; enabled=False just clears any current run."""
+    _local.run = Run(label, time.time()) if enabled else None
+    _local.clock = time.perf_counter()
+
+
+def end_run() -> Run | None:
+    """Stop recording on this thread and return the finished run, if any."""
+    run = _local.run
+    _local.run = None
+    if run is not None:
+        run.total = time.perf_counter() - _local.clock
+    return run
+
+
+def current_run() -> Run | None:
+    return _local.run
+
+
+def stage(name: str):
+    """Context manager timing its block under name when a run is active."""
+    run = _local.run
+    return _NOOP if run is None else _Stage(run, name)
+
+
+def timed(name: str | None = None) -> Callable:
+    """Decorator form of stage(); the name defaults to module.function."""
+
+    def decorate(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = _local.run
+            if run is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                run.add(label, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name: str, n: int = 1) -> None:
+    run = _local.run
+    if run is not None:
+        run.counters[name] = run.counters.get(name, 0) + n
+
+
+def to_json(runs: Iterable[Run]) -> str:
+    return json.dumps([asdict(run) for run in runs], indent=2)
+
+
+def dump_json(runs: Iterable[Run], path: Path) -> None:
+    Path(path).write_text(to_json(runs) + "\n")
+
+
+def profile_bytes(profiler: cProfile.Profile) -> bytes:
+    """A stopped profiler's stats in the .prof format read by pstats and snakeviz."""
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+def profile_summary(profiler: cProfile.Profile, limit: int = 25, sort: str = "cumulative") -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
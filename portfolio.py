@@ -0,0 +1,130 @@
+import numpy as np
+from dataclasses import dataclass
+
+from model import BlackScholesBatch
+
+RISK_FIELDS = ("value", "delta", "gamma", "vega", "theta", "rho")
+
+
+@dataclass
+class RiskSummary:
+    underlyings: list[str]
+    positions: np.ndarray
+    spots: np.ndarray
+    value: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    rho: np.ndarray
+
+
+class Portfolio:
+    """
+    Book of option positions held as parallel NumPy columns.
+
+    Positions are stored sorted by underlying so each underlying owns one
+    contiguous slice. Position-level risk (quantity-weighted value and
+    Greeks, in the same units as BlackScholes) is computed for the whole book
+    in one vectorized pass; set_spot() re-risks only the slice of the
+    underlying that moved.
+    """
+
+    def __init__(
+        self,
+        underlying,
+        quantity,
+        strike,
+        expiry,
+        is_call,
+        sigma,
+        spots: dict[str, float],
+        r: float = 0.05,
+    ):
+        names = np.asarray(underlying, dtype=str)
+        unknown = set(np.unique(names)) - set(spots)
+        if unknown:
+            raise ValueError(f"no spot given for underlying(s): {', '.join(sorted(unknown))}")
+        self.underlyings = sorted(spots)
+        codes = np.searchsorted(self.underlyings, names)
+
+        order = np.argsort(codes, kind="stable")
+        self.underlying = codes[order]
+        self.quantity = np.asarray(quantity, dtype=float)[order]
+        self.strike = np.asarray(strike, dtype=float)[order]
+        self.expiry = np.asarray(expiry, dtype=float)[order]
+        self.is_call = np.asarray(is_call, dtype=bool)[order]
+        self.sigma = np.broadcast_to(np.asarray(sigma, dtype=float), names.shape)[order]
+        self.spots = np.array([spots[name] for name in self.underlyings], dtype=float)
+        self.r = r
+
+        # Start/stop offsets of each underlying's slice
+        bounds = np.searchsorted(self.underlying, np.arange(len(self.underlyings) + 1))
+        self._slices = [slice(bounds[i], bounds[i + 1]) for i in range(len(self.underlyings))]
+        self._risk = {field: np.zeros(len(self)) for field in RISK_FIELDS}
+        self._reprice(slice(None))
+
+    def __len__(self) -> int:
+        return self.quantity.size
+
+    @classmethod
+    def random(cls, n: int, underlyings: int = 10, seed: int = 0, r: float = 0.05) -> "Portfolio":
+        """Generate a synthetic book, mainly for demos and benchmarks."""
+        rng = np.random.default_rng(seed)
+        names = [f"U{i:02d}" for i in range(underlyings)]
+        spots = dict(zip(names, rng.uniform(20, 500, underlyings)))
+        underlying = rng.choice(names, n)
+        spot = np.array([spots[u] for u in underlying])
+        return cls(
+            underlying=underlying,
+            quantity=rng.integers(-50, 51, n),
+            strike=spot * rng.uniform(0.7, 1.3, n),
+            expiry=rng.uniform(0.02, 2.0, n),
+            is_call=rng.random(n) < 0.5,
+            sigma=rng.uniform(0.1, 0.6, n),
+            spots=spots,
+            r=r,
+        )
+
+    def _reprice(self, rows: slice) -> None:
+        spot = self.spots[self.underlying[rows]]
+        values = BlackScholesBatch(spot, self.strike[rows], self.expiry[rows], self.r, self.sigma[rows]).price_all()
+        is_call = self.is_call[rows]
+        quantity = self.quantity[rows]
+        call, put = values.call_greeks, values.put_greeks
+        self._risk["value"][rows] = quantity * np.where(is_call, values.call_price, values.put_price)
+        self._risk["delta"][rows] = quantity * np.where(is_call, call.delta, put.delta)
+        self._risk["gamma"][rows] = quantity * call.gamma
+        self._risk["vega"][rows] = quantity * call.vega
+        self._risk["theta"][rows] = quantity * np.where(is_call, call.theta, put.theta)
+        self._risk["rho"][rows] = quantity * np.where(is_call, call.rho, put.rho)
+
+    def set_spot(self, underlying: str, spot: float) -> int:
+        """Move one underlying and re-risk only its positions; returns how many."""
+        code = self.underlyings.index(underlying)
+        self.spots[code] = spot
+        rows = self._slices[code]
+        self._reprice(rows)
+        return rows.stop - rows.start
+
+    def set_rate(self, r: float) -> None:
+        self.r = r
+        self._reprice(slice(None))
+
+    def position_risk(self, field: str) -> np.ndarray:
+        """Quantity-weighted value or Greek per position, in storage order."""
+        return self._risk[field]
+
+    def aggregate(self) -> RiskSummary:
+        """Sum position risk per underlying."""
+        n = len(self.underlyings)
+        sums = {
+            field: np.bincount(self.underlying, weights=self._risk[field], minlength=n)
+            for field in RISK_FIELDS
+        }
+        return RiskSummary(
+            underlyings=list(self.underlyings),
+            positions=np.bincount(self.underlying, minlength=n),
+            spots=self.spots.copy(),
+            **sums,
+        )
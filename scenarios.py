@@ -0,0 +1,127 @@
+"""
+Stress-scenario cubes over spot, volatility, rate and days forward.
+
+The full tensor is evaluated through BlackScholesBatch in flat chunks and
+comes back as a LabeledArray so any 2D plane can be sliced out without
+recomputing. An explicit memory budget covers the result and the working
+set of each chunk together.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from model import BlackScholesBatch, OptionValues
+
+DIMS = ("spot", "vol", "rate", "days")
+
+METRICS = {
+    "call_price": lambda v: v.call_price,
+    "put_price": lambda v: v.put_price,
+    "call_delta": lambda v: v.call_greeks.delta,
+    "put_delta": lambda v: v.put_greeks.delta,
+    "gamma": lambda v: v.call_greeks.gamma,
+    "vega": lambda v: v.call_greeks.vega,
+    "call_theta": lambda v: v.call_greeks.theta,
+    "put_theta": lambda v: v.put_greeks.theta,
+    "call_rho": lambda v: v.call_greeks.rho,
+    "put_rho": lambda v: v.put_greeks.rho,
+}
+
+# Peak bytes per scenario held by BlackScholesBatch.price_all() and the
+# index arrays while one chunk is evaluated (measured ~300, with headroom).
+WORKING_BYTES_PER_ELEMENT = 480
+
+
+def cube_nbytes(shape: tuple[int, ...], n_metrics: int = 1, dtype=np.float32) -> int:
+    """Bytes of a scenario_cube() result over axes of this shape."""
+    return n_metrics * int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+
+@dataclass
+class LabeledArray:
+    values: np.ndarray
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def index(self, dim: str, label) -> int:
+        """Position of label along dim; numeric labels snap to the nearest coordinate."""
+        coord = self.coords[dim]
+        if coord.dtype.kind in "fiu":
+            return int(np.abs(coord - label).argmin())
+        return int(np.flatnonzero(coord == label)[0])
+
+    def sel(self, **labels) -> "LabeledArray":
+        """Fix one or more dimensions at a label, dropping them. Returns a view."""
+        key = tuple(self.index(dim, labels[dim]) if dim in labels else slice(None) for dim in self.dims)
+        dims = tuple(dim for dim in self.dims if dim not in labels)
+        return LabeledArray(self.values[key], dims, {dim: self.coords[dim] for dim in dims})
+
+    def plane(self, y: str, x: str, **fixed) -> "LabeledArray":
+        """2D slice with rows along y and columns along x; every other dim must be fixed."""
+        missing = set(self.dims) - {x, y} - set(fixed)
+        if missing:
+            raise ValueError(f"fix a value for: {', '.join(sorted(missing))}")
+        flat = self.sel(**fixed)
+        values = flat.values if flat.dims == (y, x) else flat.values.T
+        return LabeledArray(values, (y, x), {y: self.coords[y], x: self.coords[x]})
+
+
+def scenario_cube(
+    K: float,
+    T: float,
+    spots,
+    vols,
+    rates,
+    days,
+    metrics: tuple[str, ...] = ("call_price", "put_price"),
+    memory_budget: int = 256 * 2**20,
+    dtype=np.float32,
+) -> LabeledArray:
+    """
+    Evaluate metrics over every (spot, vol, rate, days forward) combination.
+
+    spots, vols and rates are absolute levels; days are calendar days
+    forward, so the time to expiry of each scenario is T - days / 365.
+    The result has dims ("metric", "spot", "vol", "rate", "days") and takes
+    cube_nbytes() bytes; what memory_budget leaves after it bounds the
+    working set of each evaluated chunk. Raises ValueError if the result
+    alone does not fit the budget.
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"unknown metric(s): {', '.join(sorted(unknown))}")
+
+    coords = {
+        dim: np.atleast_1d(np.asarray(axis, dtype=float))
+        for dim, axis in zip(DIMS, (spots, vols, rates, days))
+    }
+    shape = tuple(coords[dim].size for dim in DIMS)
+    total = int(np.prod(shape))
+    working_budget = memory_budget - cube_nbytes(shape, len(metrics), dtype)
+    if working_budget < WORKING_BYTES_PER_ELEMENT:
+        raise ValueError(
+            f"a {' x '.join(map(str, shape))} cube of {len(metrics)} metric(s) needs "
+            f"{cube_nbytes(shape, len(metrics), dtype) / 2**20:,.0f} MB, over the {memory_budget / 2**20:,.0f} MB budget"
+        )
+    out = np.empty((len(metrics), total), dtype=dtype)
+
+    chunk = working_budget // WORKING_BYTES_PER_ELEMENT
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+        spot_i, vol_i, rate_i, day_i = np.unravel_index(np.arange(start, stop), shape)
+        values: OptionValues = BlackScholesBatch(
+            coords["spot"][spot_i],
+            K,
+            T - coords["days"][day_i] / 365,
+            coords["rate"][rate_i],
+            coords["vol"][vol_i],
+        ).price_all()
+        for m, name in enumerate(metrics):
+            out[m, start:stop] = METRICS[name](values)
+
+    coords = {"metric": np.asarray(metrics), **coords}
+    return LabeledArray(out.reshape(len(metrics), *shape), ("metric",) + DIMS, coords)
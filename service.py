@@ -0,0 +1,357 @@
+"""
+Headless Black-Scholes pricing over HTTP/JSON, with request micro-batching.
+
+Concurrent requests are held for at most --max-delay-ms, or until
+--max-batch of them are waiting, then priced together in one
+BlackScholesBatch call and answered individually. Standard library plus
+NumPy only.
+
+    python service.py serve --port 8765
+    python service.py serve --max-batch 512 --max-delay-ms 1 --record
+    python service.py bench --clients 64 --requests 20000
+
+    curl -s localhost:8765/price -d '{"S": 100, "K": 100, "T": 1, "r": 0.05, "sigma": 0.2}'
+
+POST /price takes one {S, K, T, r, sigma} object or a list of them and
+returns the prices and Greeks (same units as BlackScholes) in the same
+shape. GET /health and GET /stats report liveness and batching counters.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from model import BlackScholesBatch
+
+INPUT_FIELDS = ("S", "K", "T", "r", "sigma")
+GREEK_FIELDS = ("delta", "gamma", "theta", "vega", "rho")
+MAX_BODY_BYTES = 1 << 20
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+def parse_inputs(item) -> tuple[float, ...]:
+    """Validate one request object into an (S, K, T, r, sigma) tuple."""
+    if not isinstance(item, dict):
+        raise HTTPError(400, "each request must be a JSON object")
+    missing = [name for name in INPUT_FIELDS if name not in item]
+    if missing:
+        raise HTTPError(400, f"missing field(s): {', '.join(missing)}")
+    try:
+        S, K, T, r, sigma = (float(item[name]) for name in INPUT_FIELDS)
+    except (TypeError, ValueError):
+        raise HTTPError(400, "S, K, T, r and sigma must be numbers") from None
+    if not all(math.isfinite(x) for x in (S, K, T, r, sigma)):
+        raise HTTPError(400, "inputs must be finite")
+    if S <= 0 or K <= 0 or T < 0 or sigma < 0:
+        raise HTTPError(400, "need S > 0, K > 0, T >= 0 and sigma >= 0")
+    return S, K, T, r, sigma
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent price() calls into one vectorized pricing pass.
+
+    The first waiting request opens a window of max_delay seconds; the
+    batch is priced when the window closes or max_batch requests are
+    waiting, whichever comes first. With record=True each batch is saved
+    through database.save_results on a background thread, off the
+    response path.
+    """
+
+    def __init__(self, max_batch: int = 256, max_delay: float = 0.002, record: bool = False):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.record = record
+        self.stats = BatchStats()
+        self._pending: list[tuple[tuple[float, ...], asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+        self._db_executor = ThreadPoolExecutor(max_workers=1) if record else None
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._db_executor is not None:
+            self._db_executor.shutdown(wait=True)
+
+    async def price(self, inputs: tuple[float, ...]) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((inputs, future))
+        self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self.max_batch and self.max_delay > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+            if not self._pending:
+                self._wakeup.clear()
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[tuple[tuple[float, ...], asyncio.Future]]) -> None:
+        inputs = np.array([item for item, _ in batch], dtype=float)
+        try:
+            values = BlackScholesBatch(*inputs.T).price_all()
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        # tolist() converts each column to Python floats in one call
+        call_price, put_price = values.call_price.tolist(), values.put_price.tolist()
+        call = [getattr(values.call_greeks, name).tolist() for name in GREEK_FIELDS]
+        put = [getattr(values.put_greeks, name).tolist() for name in GREEK_FIELDS]
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(
+                    {
+                        "call_price": call_price[i],
+                        "put_price": put_price[i],
+                        "call": {name: column[i] for name, column in zip(GREEK_FIELDS, call)},
+                        "put": {name: column[i] for name, column in zip(GREEK_FIELDS, put)},
+                    }
+                )
+
+        self.stats.requests += len(batch)
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        if self._db_executor is not None:
+            import database as db
+
+            self._db_executor.submit(db.save_results, *inputs.T, values)
+
+
+class PricingService:
+    """Minimal HTTP/1.1 front end (keep-alive, Content-Length bodies) for a MicroBatcher."""
+
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = False
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise HTTPError(413, f"body exceeds {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length)
+                    status, payload = 200, await self.route(method, target.split("?", 1)[0], body)
+                except HTTPError as exc:
+                    status, payload = exc.status, {"error": str(exc)}
+                except ValueError:
+                    status, payload, keep_alive = 400, {"error": "malformed request"}, False
+
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, path: str, body: bytes):
+        if path == "/price":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "body is not valid JSON") from None
+            if isinstance(data, list):
+                inputs = [parse_inputs(item) for item in data]
+                return list(await asyncio.gather(*(self.batcher.price(item) for item in inputs)))
+            return await self.batcher.price(parse_inputs(data))
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/stats":
+            stats = self.batcher.stats
+            return {**asdict(stats), "mean_batch": stats.mean_batch}
+        raise HTTPError(404, f"no route for {path}")
+
+
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def serve(host: str, port: int, max_batch: int, max_delay: float, record: bool) -> None:
+    batcher = MicroBatcher(max_batch, max_delay, record)
+    await batcher.start()
+    server = await asyncio.start_server(PricingService(batcher).handle, host, port)
+    print(f"Pricing service on http://{host}:{port} (max batch {max_batch}, max delay {max_delay * 1e3:g} ms)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+async def benchmark(clients: int, requests: int, max_batch: int, max_delay: float, seed: int = 0) -> dict:
+    """
+    Load-test an in-process server over loopback.
+
+    clients keep-alive connections each send requests / clients sequential
+    single-option requests. The load generator shares the server's event
+    loop, so absolute numbers are conservative; compare settings instead.
+    """
+    batcher = MicroBatcher(max_batch, max_delay)
+    await batcher.start()
+    server = await asyncio.start_server(PricingService(batcher).handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    rng = np.random.default_rng(seed)
+    params = rng.uniform([50, 50, 0.05, 0.0, 0.05], [150, 150, 2.0, 0.1, 0.8], size=(requests, 5))
+    bodies = [json.dumps(dict(zip(INPUT_FIELDS, row))).encode() for row in params.tolist()]
+    latencies: list[float] = []
+
+    async def client(share: list[bytes]) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for body in share:
+            start = time.perf_counter()
+            writer.write(b"POST /price HTTP/1.1\r\nHost: localhost\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"request failed with HTTP {status}")
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(bodies[i::clients]) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+    await batcher.stop()
+
+    latency_us = np.asarray(latencies) * 1e6
+    return {
+        "max_batch": max_batch,
+        "max_delay_ms": max_delay * 1e3,
+        "requests": requests,
+        "requests_per_sec": requests / elapsed,
+        "p50_us": float(np.percentile(latency_us, 50)),
+        "p99_us": float(np.percentile(latency_us, 99)),
+        "mean_batch": batcher.stats.mean_batch,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_batching(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--max-batch", type=int, default=256, help="price as soon as this many requests wait")
+        sub.add_argument("--max-delay-ms", type=float, default=2.0, help="longest a request waits for company")
+
+    serve_cmd = commands.add_parser("serve", help="run the HTTP service")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+    serve_cmd.add_argument("--record", action="store_true", help="save every priced request to the calculations table")
+    add_batching(serve_cmd)
+
+    bench_cmd = commands.add_parser("bench", help="measure throughput and latency with a local load generator")
+    bench_cmd.add_argument("--clients", type=int, default=64, help="concurrent keep-alive connections")
+    bench_cmd.add_argument("--requests", type=int, default=20_000)
+    bench_cmd.add_argument("--no-baseline", action="store_true", help="skip the unbatched (max batch 1) comparison run")
+    add_batching(bench_cmd)
+
+    args = parser.parse_args(argv)
+    max_delay = args.max_delay_ms / 1e3
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.max_batch, max_delay, args.record))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    settings = [(args.max_batch, max_delay)]
+    if not args.no_baseline:
+        settings.insert(0, (1, 0.0))
+    print(f"{'max batch':>10} {'delay ms':>9} {'req/sec':>10} {'p50 us':>9} {'p99 us':>9} {'mean batch':>11}")
+    for max_batch, delay in settings:
+        result = asyncio.run(benchmark(args.clients, args.requests, max_batch, delay))
+        print(
+            f"{result['max_batch']:>10} {result['max_delay_ms']:>9.2f} {result['requests_per_sec']:>10,.0f} "
+            f"{result['p50_us']:>9,.0f} {result['p99_us']:>9,.0f} {result['mean_batch']:>11.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import re
+
+import streamlit as st
+
+_STYLESHEET = """
+<style>
+    /* Global Font Stack - System fonts for platform-native feel */
+    html, body, [class*="css"] {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
+    }
+
+    * {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
+    }
+
+    /* Header Styling - Classic Apple weight and letter-spacing */
+    h1, h2, h3, h4, h5, h6 {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
+        font-weight: 700 !important;
+        letter-spacing: -0.5px !important;
+    }
+
+    h1 {
+        font-size: 2.4rem !important;
+        margin-bottom: 0.5rem !important;
+        color: #1D1D1F !important;
+    }
+
+    h2 {
+        font-size: 1.8rem !important;
+        margin-top: 2rem !important;
+        margin-bottom: 1rem !important;
+        color: #1D1D1F !important;
+    }
+
+    h3 {
+        font-size: 1.3rem !important;
+        margin-top: 1.5rem !important;
+        margin-bottom: 0.8rem !important;
+        color: #1D1D1F !important;
+    }
+
+    /* Body text */
+    p, label, div, span {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif !important;
+        font-weight: 400 !important;
+        font-size: 1rem !important;
+        line-height: 1.6 !important;
+        color: #1D1D1F !important;
+    }
+
+    /* Metric Cards - White boxes with rounded corners and subtle shadow */
+    [data-testid="stMetric"] {
+        background-color: #FFFFFF !important;
+        border: 1px solid rgba(0, 0, 0, 0.05) !important;
+        border-radius: 18px !important;
+        padding: 20px !important;
+        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.08) !important;
+        transition: all 0.3s cubic-bezier(0.34, 1.56, 0.64, 1) !important;
+    }
+
+    [data-testid="stMetric"]:hover {
+        box-shadow: 0 8px 25px rgba(0, 0, 0, 0.12) !important;
+        transform: translateY(-4px) !important;
+    }
+
+    [data-testid="stMetricLabel"] {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif !important;
+        font-size: 0.9rem !important;
+        font-weight: 500 !important;
+        color: #86868B !important;
+        text-transform: none !important;
+        margin-bottom: 8px !important;
+        letter-spacing: 0px !important;
+    }
+
+    [data-testid="stMetricValue"] {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif !important;
+        font-size: 1.9rem !important;
+        font-weight: 700 !important;
+        color: #1D1D1F !important;
+        letter-spacing: -0.5px !important;
+    }
+
+    /* Sidebar Styling */
+    [data-testid="stSidebar"] {
+        background-color: #F5F5F7 !important;
+    }
+
+    [data-testid="stSidebar"] > div:first-child {
+        padding-top: 1.5rem !important;
+    }
+
+    /* Number Input Fields */
+    [data-testid="stNumberInput"] input {
+        border-radius: 12px !important;
+        border: 1px solid #E5E5EA !important;
+        padding: 12px 14px !important;
+        font-size: 1rem !important;
+        background-color: #FFFFFF !important;
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+    }
+
+    [data-testid="stNumberInput"] input:focus {
+        border-color: #007AFF !important;
+        box-shadow: 0 0 0 3px rgba(0, 122, 255, 0.1) !important;
+        outline: none !important;
+    }
+
+    /* Text Input Fields */
+    input[type="text"], input[type="password"] {
+        border-radius: 12px !important;
+        border: 1px solid #E5E5EA !important;
+        padding: 12px 14px !important;
+        font-size: 1rem !important;
+        background-color: #FFFFFF !important;
+    }
+
+    input[type="text"]:focus, input[type="password"]:focus {
+        border-color: #007AFF !important;
+        box-shadow: 0 0 0 3px rgba(0, 122, 255, 0.1) !important;
+    }
+
+    /* Primary Button */
+    button[kind="primary"] {
+        background-color: #007AFF !important;
+        color: #FFFFFF !important;
+        border: none !important;
+        border-radius: 12px !important;
+        font-weight: 600 !important;
+        font-size: 1rem !important;
+        padding: 12px 20px !important;
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+        transition: all 0.2s ease !important;
+    }
+
+    button[kind="primary"]:hover {
+        background-color: #0051D5 !important;
+        box-shadow: 0 6px 12px rgba(0, 122, 255, 0.3) !important;
+    }
+
+    button[kind="primary"]:active {
+        background-color: #0041B8 !important;
+        transform: scale(0.98) !important;
+    }
+
+    /* Secondary Button */
+    button[kind="secondary"] {
+        background-color: #F5F5F7 !important;
+        color: #007AFF !important;
+        border: 1px solid #E5E5EA !important;
+        border-radius: 12px !important;
+        font-weight: 600 !important;
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+    }
+
+    button[kind="secondary"]:hover {
+        background-color: #EBEBF0 !important;
+    }
+
+    /* Radio Buttons */
+    [data-testid="stRadio"] {
+        margin-top: 0.5rem !important;
+    }
+
+    [data-testid="stRadio"] label {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+        font-weight: 500 !important;
+        color: #1D1D1F !important;
+        margin-left: 8px !important;
+    }
+
+    /* Checkbox */
+    [data-testid="stCheckbox"] label {
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+        font-weight: 500 !important;
+        color: #1D1D1F !important;
+        margin-left: 8px !important;
+    }
+
+    /* Dividers */
+    hr {
+        border: none !important;
+        height: 1px !important;
+        background: rgba(0, 0, 0, 0.08) !important;
+        margin: 2rem 0 !important;
+    }
+
+    /* Dataframe Table */
+    [data-testid="stDataframe"] {
+        border: 1px solid #E5E5EA !important;
+        border-radius: 14px !important;
+        overflow: hidden !important;
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.06) !important;
+    }
+
+    /* Info Message */
+    [data-testid="stInfo"] {
+        background-color: #E8F4FF !important;
+        border: 1px solid #B3D9FF !important;
+        border-radius: 14px !important;
+        padding: 15px !important;
+        font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif !important;
+    }
+
+    /* Warning Message */
+    [data-testid="stWarning"] {
+        background-color: #FFF8E1 !important;
+        border: 1px solid #FFD966 !important;
+        border-radius: 14px !important;
+        padding: 15px !important;
+    }
+
+    /* Error Message */
+    [data-testid="stError"] {
+        background-color: #FFE8E8 !important;
+        border: 1px solid #FF6B6B !important;
+        border-radius: 14px !important;
+        padding: 15px !important;
+    }
+
+    /* Success Message */
+    [data-testid="stSuccess"] {
+        background-color: #E8F5E9 !important;
+        border: 1px solid #81C784 !important;
+        border-radius: 14px !important;
+        padding: 15px !important;
+    }
+</style>
+"""
+
+
+def _minify(css: str) -> str:
+    """Drop comments and the whitespace around CSS punctuation."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r" ?([{};>,]) ?", r"\1", css).replace(": ", ":").strip()
+
+
+# Built once per process; every rerun still has to send it, since Streamlit
+# drops elements a rerun does not re-emit
+_CSS = _minify(_STYLESHEET)
+
+
+def inject_custom_css() -> None:
+    """
+    Inject comprehensive iOS/Apple-style CSS for system fonts and refined UI.
+    
+    This function enforces:
+    - System font stack (San Francisco on Mac, Segoe UI on Windows)
+    - Apple-style header typography with tight letter-spacing
+    - Metric cards with rounded corners and subtle shadows
+    - Consistent design across all components
+    """
+    st.markdown(_CSS, unsafe_allow_html=True)
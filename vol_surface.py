@@ -0,0 +1,186 @@
+"""
+Implied-volatility surfaces from raw SVI slices.
+
+Each expiry's quotes are fitted with Gatheral's raw SVI smile in total
+implied variance w(k) = sigma^2 T against forward log-moneyness
+k = log(K / (S e^{rT})). Between expiries total variance is interpolated
+linearly in T at fixed k; outside them the nearest slice's vol is held
+flat. Fits are cached by a hash of each slice's data, so recalibrating a
+chain only refits the expiries whose quotes changed.
+"""
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from cache import LRUCache
+
+# SVI has five parameters; fewer quotes than this do not pin a slice down
+MIN_QUOTES = 5
+
+# Shared by every VolSurface in the process, keyed by slice data hash
+_fits = LRUCache(maxsize=512)
+
+
+@dataclass(frozen=True)
+class SVIParams:
+    a: float
+    b: float
+    rho: float
+    m: float
+    s: float
+
+    def total_variance(self, k):
+        return self.a + self.b * (self.rho * (k - self.m) + np.sqrt((k - self.m) ** 2 + self.s**2))
+
+
+@dataclass
+class SliceFit:
+    T: float
+    params: SVIParams
+    rmse: float  # root-mean-square implied vol error of the fit
+    quotes: int
+    data_hash: str
+
+
+def _slice_hash(S: float, r: float, T: float, K: np.ndarray, iv: np.ndarray, weights: np.ndarray) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array([S, r, T], dtype=float).tobytes())
+    for column in (K, iv, weights):
+        digest.update(np.ascontiguousarray(column, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def fit_svi(k: np.ndarray, w: np.ndarray, weights: np.ndarray | None = None) -> SVIParams:
+    """
+    Least-squares raw SVI fit of total variance w against log-moneyness k.
+
+    Starts from a few skews and keeps the best fit. The minimum of the
+    smile, a + b*s*sqrt(1 - rho^2), is penalised below zero so the fitted
+    variance stays non-negative.
+    """
+    from scipy.optimize import least_squares  # ~0.5 s to import; only needed when a slice is refitted
+
+    weights = np.ones_like(w) if weights is None else weights
+    k_span = max(np.ptp(k), 0.1)
+
+    def residuals(x: np.ndarray) -> np.ndarray:
+        a, b, rho, m, s = x
+        fitted = a + b * (rho * (k - m) + np.sqrt((k - m) ** 2 + s**2))
+        floor = min(a + b * s * np.sqrt(1 - rho**2), 0.0)
+        return np.append(weights * (fitted - w), 10 * floor)
+
+    w_max = w.max()
+    lower = [-w_max, 0.0, -0.999, k.min() - k_span, 1e-4]
+    upper = [w_max, 4.0 * w_max / k_span + 1.0, 0.999, k.max() + k_span, 2 * k_span]
+    m0, s0, b0 = k[np.argmin(w)], 0.1 * k_span, 0.1
+    best = None
+    for rho0 in (-0.5, 0.0, 0.5):
+        a0 = min(max(w.min() - b0 * s0, -0.5 * w_max), w_max)
+        start = np.clip([a0, b0, rho0, m0, s0], lower, upper)
+        result = least_squares(residuals, start, bounds=(lower, upper), method="trf", x_scale="jac")
+        if best is None or result.cost < best.cost:
+            best = result
+    return SVIParams(*(float(x) for x in best.x))
+
+
+class VolSurface:
+    """
+    Implied vol surface for one underlying at spot S and rate r.
+
+    calibrate() fits one SVI slice per distinct expiry, reusing cached
+    fits for slices whose data hash is unchanged; last_refit counts the
+    slices it actually fitted. sigma(K, T) then evaluates the surface over
+    broadcast arrays with a handful of vectorized NumPy operations.
+    """
+
+    def __init__(self, S: float, r: float):
+        self.S = S
+        self.r = r
+        self.slices: dict[float, SliceFit] = {}
+        self.last_refit = 0
+        self._expiries = np.empty(0)
+        self._params = np.empty((0, 5))
+
+    def calibrate(self, K, T, iv, weights=None) -> "VolSurface":
+        """Fit every expiry in a chain of (K, T, implied vol) quotes."""
+        K, T, iv = (np.asarray(x, dtype=float).ravel() for x in (K, T, iv))
+        weights = np.ones_like(iv) if weights is None else np.asarray(weights, dtype=float).ravel()
+        if not (K.shape == T.shape == iv.shape == weights.shape):
+            raise ValueError("K, T, iv and weights must have the same length")
+        if np.any(T <= 0) or np.any(iv <= 0) or np.any(K <= 0):
+            raise ValueError("quotes need K > 0, T > 0 and iv > 0")
+
+        slices = {}
+        refit = 0
+        for expiry in np.unique(T):
+            rows = T == expiry
+            order = np.argsort(K[rows])
+            k_slice, iv_slice, w_slice = K[rows][order], iv[rows][order], weights[rows][order]
+            if k_slice.size < MIN_QUOTES:
+                raise ValueError(f"expiry T={expiry:g} has {k_slice.size} quotes; SVI needs at least {MIN_QUOTES}")
+
+            data_hash = _slice_hash(self.S, self.r, expiry, k_slice, iv_slice, w_slice)
+            if data_hash not in _fits:
+                refit += 1
+            params, rmse = _fits.get_or_compute(
+                data_hash, lambda: self._fit_slice(expiry, k_slice, iv_slice, w_slice)
+            )
+            slices[float(expiry)] = SliceFit(float(expiry), params, rmse, int(k_slice.size), data_hash)
+
+        self.slices = slices
+        self.last_refit = refit
+        self._expiries = np.array(list(slices))
+        self._params = np.array([[p.a, p.b, p.rho, p.m, p.s] for p in (f.params for f in slices.values())])
+        return self
+
+    def _fit_slice(self, T: float, K: np.ndarray, iv: np.ndarray, weights: np.ndarray) -> tuple[SVIParams, float]:
+        k = np.log(K / (self.S * np.exp(self.r * T)))
+        params = fit_svi(k, iv**2 * T, weights)
+        fitted = np.sqrt(np.maximum(params.total_variance(k), 0.0) / T)
+        return params, float(np.sqrt(np.mean((fitted - iv) ** 2)))
+
+    def sigma(self, K, T) -> np.ndarray:
+        """Implied vol at strikes K and expiries T (broadcast together)."""
+        if not self.slices:
+            raise ValueError("calibrate the surface before looking up vols")
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        expiries, params = self._expiries, self._params
+        # Flat vol beyond the first and last expiries
+        T_eff = np.clip(T, expiries[0], expiries[-1])
+        k = np.log(K / self.S) - self.r * T_eff
+
+        hi = np.minimum(np.searchsorted(expiries, T_eff), len(expiries) - 1)
+        lo = np.maximum(hi - 1, 0)
+        T_lo, T_hi = expiries[lo], expiries[hi]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alpha = np.where(T_hi > T_lo, (T_eff - T_lo) / (T_hi - T_lo), 1.0)
+
+        def slice_variance(i: np.ndarray) -> np.ndarray:
+            a, b, rho, m, s = params[i].T
+            x = k - m
+            return a + b * (rho * x + np.sqrt(x * x + s * s))
+
+        w = (1 - alpha) * slice_variance(lo) + alpha * slice_variance(hi)
+        return np.sqrt(np.maximum(w, 0.0) / T_eff)
+
+    def smile(self, T: float, K) -> np.ndarray:
+        """Fitted vols of the slice at expiry T (which must be calibrated)."""
+        fit = self.slices[float(T)]
+        k = np.log(np.asarray(K, dtype=float) / (self.S * np.exp(self.r * fit.T)))
+        return np.sqrt(np.maximum(fit.params.total_variance(k), 0.0) / fit.T)
+
+
+def demo_chain(S: float, r: float = 0.05, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A synthetic skewed (K, T, iv) chain around S with a little quote noise."""
+    rng = np.random.default_rng(seed)
+    K, T, iv = [], [], []
+    for expiry in (0.1, 0.25, 0.5, 1.0, 2.0):
+        strikes = S * np.exp(np.linspace(-0.4, 0.3, 15) * np.sqrt(expiry))
+        k = np.log(strikes / (S * np.exp(r * expiry)))
+        true = SVIParams(a=0.02 * expiry, b=0.1 * np.sqrt(expiry), rho=-0.6, m=0.02, s=0.15 * np.sqrt(expiry))
+        vols = np.sqrt(true.total_variance(k) / expiry + 0.03) + rng.normal(0, 0.002, k.size)
+        K.append(strikes)
+        T.append(np.full(k.size, expiry))
+        iv.append(vols)
+    return np.concatenate(K), np.concatenate(T), np.concatenate(iv)